@@ -1,12 +1,50 @@
 # %% =======================================================
 """ General parameters"""
 
+import functools
 import os
 from sync_data import create_sync_manager
 
+
+@functools.lru_cache(maxsize=64)
+def _exists(path):
+    """os.path.exists with memoization so each probe is stat'd only once."""
+    return os.path.exists(path)
+
+
+def _find_thumbdrive():
+    """Find the thumb drive mount point with a single directory scan.
+
+    Instead of stat-ing each candidate mount point one at a time, read
+    /media/mmchenry once with os.scandir and match the known drive names
+    in memory. Only the fixed /mnt and /Volumes fallbacks still need an
+    individual check.
+    """
+    candidates = frozenset({"thumbdrive", "USB_DRIVE", "ThumbDrive"})
+
+    try:
+        with os.scandir("/media/mmchenry") as it:
+            present = {e.name for e in it if e.is_dir(follow_symlinks=False)}
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        present = set()
+
+    for name in sorted(present & candidates):
+        return f"/media/mmchenry/{name}"
+
+    # Fixed mount points outside /media/mmchenry still need a direct check
+    for path in ["/mnt/thumbdrive", "/Volumes/Shared/catfish_kinematics"]:
+        if _exists(path):
+            return path
+
+    return None
+
 # Whether to use checksum mode, which is more robust but slower
 checksum_mode = False
 
+# Digest used for checksum-mode change detection ("xxh128" is much faster
+# than "md5"; md5 remains available for compatibility with stock rsync)
+hash_algo = "xxh128"
+
 # List of data directories to sync
 data_dirs = [
     "mean_images",
@@ -29,56 +67,72 @@ one_way_video_dirs = [
 
 
 # %% =======================================================
-""" Paths for Linux machine + Thumb drive """
-
-# WORK Linux directory
-if os.path.exists("/vortex/schooling_video") and os.path.exists("/flux/schooling_data"):
-    local_data_root = "/flux/schooling_data/catfish_flowtank_kinematics"
-    local_video_root = "/vortex/schooling_video/catfish_kinematics"
-    local_log_root = "/flux/schooling_data/catfish_flowtank_log"
-    print("✓ Using NETWORK paths (prioritized)")
-    
-# HOME Linux directory
-elif os.path.exists("/home/mmchenry/Documents/catfish_kinematics"):
-    local_data_root = "/home/mmchenry/Documents/catfish_kinematics/data"
-    local_video_root = "/home/mmchenry/Documents/catfish_kinematics/video"
-    local_log_root = "/home/mmchenry/Documents/catfish_flowtank_log"
-    print("⚠️  Using LOCAL paths (network not available)")
-
-# Check for Mac paths
-elif os.path.exists("/Users/mmchenry/Documents"):
-    local_data_root = "/Users/mmchenry/Documents/Projects/catfish_kinematics"
-    local_video_root = "/Users/mmchenry/Documents/Video/catfish_kinematics"
-    print("✓ Using MAC laptop paths")
-else:
+""" Host profiles """
+
+# Declarative table of known hosts. The first profile whose probe paths
+# all exist wins, so adding a machine means adding one entry here instead
+# of another if/elif branch.
+HOST_PROFILES = [
+    {
+        "name": "work_linux",
+        "probes": ["/vortex/schooling_video", "/flux/schooling_data"],
+        "local_data_root": "/flux/schooling_data/catfish_flowtank_kinematics",
+        "local_video_root": "/vortex/schooling_video/catfish_kinematics",
+        "local_log_root": "/flux/schooling_data/catfish_flowtank_log",
+        "message": "✓ Using NETWORK paths (prioritized)",
+    },
+    {
+        "name": "home_linux",
+        "probes": ["/home/mmchenry/Documents/catfish_kinematics"],
+        "local_data_root": "/home/mmchenry/Documents/catfish_kinematics/data",
+        "local_video_root": "/home/mmchenry/Documents/catfish_kinematics/video",
+        "local_log_root": "/home/mmchenry/Documents/catfish_flowtank_log",
+        "message": "⚠️  Using LOCAL paths (network not available)",
+    },
+    {
+        "name": "mac_laptop",
+        "probes": ["/Users/mmchenry/Documents"],
+        "local_data_root": "/Users/mmchenry/Documents/Projects/catfish_kinematics",
+        "local_video_root": "/Users/mmchenry/Documents/Video/catfish_kinematics",
+        "local_log_root": "/Users/mmchenry/Documents/catfish_flowtank_log",
+        "message": "✓ Using MAC laptop paths",
+    },
+]
+
+
+def detect_profile():
+    """Return the first host profile whose probe paths all exist."""
+    for profile in HOST_PROFILES:
+        if all(_exists(p) for p in profile["probes"]):
+            return profile
     raise RuntimeError("Could not find directory to sync with.")
 
-# Remote volume base path - check multiple possible mount points
+
+# %% =======================================================
+""" Paths for this machine + Thumb drive """
+
+profile = detect_profile()
+print(profile["message"])
+
+local_data_root = profile["local_data_root"]
+local_video_root = profile["local_video_root"]
+local_log_root = profile["local_log_root"]
+
+# Remote volume base path - found with a single scan of the mount directory
 remote_data_root = None
 remote_video_root = None
 
-# Check for thumb drive in various locations
-thumb_drive_paths = [
-    "/mnt/thumbdrive",
-    "/media/mmchenry/thumbdrive",
-    "/media/mmchenry/USB_DRIVE",
-    "/media/mmchenry/ThumbDrive",
-    "/Volumes/Shared/catfish_kinematics"  # Mac mount point
-]
-
-for path in thumb_drive_paths:
-    if os.path.exists(path):
-        remote_data_root = path + "/data/"
-        remote_video_root = path + "/video/"
-        print(f"✓ Using THUMB drive paths: {path}")
-        break
+thumb_drive_path = _find_thumbdrive()
+if thumb_drive_path is not None:
+    remote_data_root = thumb_drive_path + "/data/"
+    remote_video_root = thumb_drive_path + "/video/"
+    print(f"✓ Using THUMB drive paths: {thumb_drive_path}")
 
 if remote_data_root is None:
-    raise RuntimeError("Could not find thumbdrive to sync with. Checked: " + ", ".join(thumb_drive_paths))
+    raise RuntimeError("Could not find thumbdrive to sync with. Checked /media/mmchenry, /mnt/thumbdrive, /Volumes/Shared/catfish_kinematics")
 
-# Local log root - syncs with remote data
-local_log_root = "/home/mmchenry/Documents/catfish_flowtank_log"
-remote_log_root = remote_data_root + "catfish_flowtank_log/"  # Logs sync to catfish_flowtank_log subdirectory in remote data
+# Logs sync to catfish_flowtank_log subdirectory in remote data
+remote_log_root = remote_data_root + "catfish_flowtank_log/"
 
 print(f"Local data root: {local_data_root}")
 print(f"Local video root: {local_video_root}")
@@ -89,58 +143,71 @@ print(f"Remote log root: {remote_log_root}")
 
 
 # %% =======================================================
-""" Create sync manager """
-
-# Create sync manager with detected paths
-sync_manager = create_sync_manager(
-    local_data_root=local_data_root,
-    local_video_root=local_video_root,
-    data_dirs=data_dirs,
-    video_dirs=video_dirs,
-    one_way_video_dirs=one_way_video_dirs,
-    remote_data_base=remote_data_root,
-    remote_video_base=remote_video_root,
-    checksum_mode=checksum_mode
-)
-
-# %% =======================================================
-""" List sync pairs """
-
-# List all available sync pairs
-print("\n" + "="*60)
-print("AVAILABLE SYNC PAIRS:")
-print("="*60)
-sync_manager.list_sync_pairs()
-
-
-# %% =======================================================
-""" Run dry run """
-
-# Run dry run to see what would be synced
-print("\n" + "="*60)
-print("DRY RUN - PREVIEW OF CHANGES:")
-print("="*60)
-sync_manager.sync_all(dry_run=True)
-
-
-# %% =======================================================
-""" Perform actual sync """
-
-# Uncomment the line below to perform actual sync
-sync_manager.sync_all(dry_run=False)
-
-
-
+""" Run the sync """
+
+
+def run(commit=False, pair=None):
+    """Build the sync manager, preview the plan, and optionally execute it.
+
+    Nothing heavier than path detection happens at import time; the full
+    sync (and in checksum mode, the full re-hash) only runs when this is
+    invoked as a script, and only writes with --commit.
+    """
+    # Create sync manager with detected paths
+    sync_manager = create_sync_manager(
+        local_data_root=local_data_root,
+        local_video_root=local_video_root,
+        data_dirs=data_dirs,
+        video_dirs=video_dirs,
+        one_way_video_dirs=one_way_video_dirs,
+        remote_data_base=remote_data_root,
+        remote_video_base=remote_video_root,
+        checksum_mode=checksum_mode,
+        hash_algo=hash_algo,
+        cache_db=os.path.join(local_log_root, ".synccache.sqlite"),
+        merkle_file=os.path.join(local_log_root, ".merkle.json")
+    )
+
+    # Sync a single named pair if requested
+    if pair is not None:
+        return sync_manager.sync_pair_by_name(pair, dry_run=not commit)
+
+    # List all available sync pairs
+    print("\n" + "="*60)
+    print("AVAILABLE SYNC PAIRS:")
+    print("="*60)
+    sync_manager.list_sync_pairs()
+
+    # Compute the plan once (single dry-run pass) and preview it
+    print("\n" + "="*60)
+    print("SYNC PLAN - PREVIEW OF CHANGES:")
+    print("="*60)
+    plan = sync_manager.plan_all()
+    sync_manager.print_plan(plan)
+
+    if not commit:
+        print("Preview only - rerun with --commit to apply these changes.")
+        return True
+
+    # Execute the plan computed above (pairs already in sync are skipped)
+    return sync_manager.execute_plan(plan)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Sync catfish kinematics data with the thumb drive")
+    ap.add_argument("--commit", action="store_true",
+                    help="Apply the planned changes (default is preview only)")
+    ap.add_argument("--pair", type=str,
+                    help="Sync only the named pair")
+    args = ap.parse_args()
+    run(commit=args.commit, pair=args.pair)
 
 
 # %% =======================================================
 """ Additional Control Options """
 
-# Sync only specific pairs (examples)
-# sync_manager.sync_pair_by_name("data_mean_images_to_local", dry_run=True)
-# sync_manager.sync_pair_by_name("video_processed_video_to_remote", dry_run=True)
-
-# You can also access individual sync pairs directly:
-# for pair in sync_manager.config["sync_pairs"]:
-#     if "processed_video" in pair["name"]:
-#         sync_manager.sync_pair(pair, dry_run=True)
\ No newline at end of file
+# Preview everything:        python main.py
+# Apply the changes:         python main.py --commit
+# Preview a single pair:     python main.py --pair data_mean_images_to_local
+# Sync a single pair:        python main.py --pair video_processed_video_to_remote --commit
\ No newline at end of file
@@ -6,110 +6,386 @@ This script synchronizes data between a remote volume and local storage location
 using rsync for efficient file transfer and synchronization.
 """
 
+import functools
 import os
+import re
+import stat
 import sys
 import subprocess
 import logging
 import argparse
+import shlex
+import shutil
+import collections
+import concurrent.futures
+import hashlib
+import heapq
 import json
+import sqlite3
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Tuple
 from datetime import datetime
 
+# Optional xxhash support for fast file digests. xxh128 hashes at several
+# GB/s per core versus ~500 MB/s for MD5, so checksum-mode syncs become
+# I/O-bound instead of CPU-bound. Falls back to MD5 when not installed
+# (pip install xxhash).
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
-def setup_sync_directories(data_dirs: List[str], video_dirs: List[str], one_way_video_dirs: List[str], 
+# Optional blake3 support for fast-verify mode. blake3 hashes with SIMD
+# and its own thread pool, several times faster than MD5 on the multi-GB
+# video files. Falls back to xxh128/MD5 when not installed
+# (pip install blake3).
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Optional orjson support for config (de)serialization. The config is
+# rewritten on every run, and orjson encodes it roughly 5x faster than the
+# stdlib encoder. Falls back to stdlib json when not installed
+# (pip install orjson).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dump_bytes(obj) -> bytes:
+    """Serialize obj to indented JSON bytes with the fastest encoder available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True).encode()
+
+
+def _json_load_bytes(data: bytes):
+    """Deserialize JSON bytes with the fastest decoder available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _new_hasher(hash_algo: str = "xxh128"):
+    """Return a fresh hasher for the chosen algorithm."""
+    if hash_algo == "blake3" and blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if hash_algo in ("xxh128", "blake3") and xxhash is not None:
+        return xxhash.xxh128()
+    return hashlib.md5()
+
+
+def hash_file(path: str, hash_algo: str = "xxh128") -> str:
+    """Compute a file digest, using xxh128 when available.
+
+    Pass hash_algo="md5" for wire compatibility with stock rsync --checksum.
+    """
+    h = _new_hasher(hash_algo)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Classifier constants for rsync output parsing, hoisted so the regex is
+# compiled once and the prefix test is a single C-level call per line
+_CHANGE_PREFIXES = ('>', '<', 'c', 'h', '*')
+_STATS_RE = re.compile(r'^(Number of files|Total (file|transferred file) size|sent |total size)')
+
+
+class ChecksumCache:
+    """Persistent digest cache keyed by (path, size, mtime_ns).
+
+    Re-running a checksum-mode sync normally re-reads and re-hashes every
+    file. By remembering each file's digest alongside its size and mtime,
+    unchanged files cost a single stat on later runs instead of a full read.
+
+    The parallel sync path calls in from worker threads, so the single
+    connection is opened with check_same_thread=False and every statement
+    runs under a lock.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS h"
+            "(path TEXT PRIMARY KEY, size INT, mtime_ns INT, digest TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rsyncable"
+            "(path TEXT PRIMARY KEY, size INT, mtime_ns INT)")
+        self.conn.commit()
+
+    def get(self, path: str, size: int, mtime_ns: int):
+        """Return the cached digest for path, or None if stale/missing."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT digest FROM h WHERE path=? AND size=? AND mtime_ns=?",
+                (path, size, mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def put(self, path: str, size: int, mtime_ns: int, digest: str):
+        """Store or refresh the digest for path."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO h(path, size, mtime_ns, digest) VALUES (?,?,?,?)",
+                (path, size, mtime_ns, digest))
+            self.conn.commit()
+
+    def is_rsyncable(self, path: str, size: int, mtime_ns: int) -> bool:
+        """True when path was already recompressed at this size/mtime."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM rsyncable WHERE path=? AND size=? AND mtime_ns=?",
+                (path, size, mtime_ns)).fetchone()
+        return row is not None
+
+    def mark_rsyncable(self, path: str, size: int, mtime_ns: int):
+        """Record that path is now --rsyncable gzip output."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rsyncable(path, size, mtime_ns) VALUES (?,?,?)",
+                (path, size, mtime_ns))
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def hash_file_cached(path: str, cache: ChecksumCache = None,
+                     hash_algo: str = "xxh128") -> str:
+    """Compute a file digest, consulting the checksum cache first."""
+    if cache is None:
+        return hash_file(path, hash_algo)
+
+    # Stat what hash_file actually reads - for a symlink that is the
+    # target; keying on the link's own metadata would serve a stale
+    # digest forever once the target changes
+    st = os.stat(path)
+    digest = cache.get(path, st.st_size, st.st_mtime_ns)
+    if digest is None:
+        digest = hash_file(path, hash_algo)
+        cache.put(path, st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def warm_directory_cache(base: str) -> None:
+    """Walk base once to pull its metadata into the OS caches.
+
+    On a cold USB mount the first sync pair pays the full latency of
+    enumerating its tree. One up-front walk issues the bulk directory
+    reads so the per-pair traversals that follow are served from memory.
+    """
+    try:
+        for _root, _dirs, _files in os.walk(base):
+            pass
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def rsync_caps() -> frozenset:
+    """Return the installed rsync's capability tokens, probed once per process.
+
+    rsync --version is a fork+exec plus a pipe read; memoizing it here
+    means every manager (and every parallel worker) shares one probe for
+    the lifetime of the process.
+    """
+    try:
+        result = subprocess.run(["rsync", "--version"],
+                                capture_output=True, text=True)
+    except OSError:
+        return frozenset()
+    if result.returncode != 0:
+        return frozenset()
+    # Tokenize the whole banner (Capabilities, Optional features and
+    # Checksum list sections) so flags like xxh3 or zstd are one lookup
+    return frozenset(re.sub(r"[(),]", " ", result.stdout).lower().split())
+
+
+# Option templates shared by every sync pair. load_config extends these
+# with the mode- and capability-dependent flags, then freezes a copy per
+# pair; keeping the static parts here means they are built exactly once.
+SAFE_OPTS = ("-a", "--no-perms", "--no-group")
+# rsync defaults to whole-file transfers on local paths, so the delta
+# and append templates state --no-whole-file explicitly (--append also
+# refuses to combine with --whole-file)
+DELTA_OPTS = ("--no-whole-file", "--inplace", "--partial")
+APPEND_OPTS = ("--no-whole-file", "--inplace", "--partial", "--append-verify")
+
+
+# Pre-rendered banner for warning blocks; emitting the whole block with a
+# single write keeps it contiguous when syncs log concurrently
+_WARNING_BANNER = "=" * 60 + "\n"
+
+
+def _scan_dir_names(base: str):
+    """Return the set of subdirectory names under base, or None when unreadable.
+
+    DirEntry.is_dir is answered from the directory read itself, so this
+    costs one getdents instead of a stat per entry.
+    """
+    try:
+        with os.scandir(base) as it:
+            return {e.name for e in it if e.is_dir(follow_symlinks=False)}
+    except FileNotFoundError:
+        return None
+    except PermissionError:
+        print(f"Warning: Cannot access {base} to check for unsynced directories")
+        return None
+
+
+def setup_sync_directories(data_dirs: List[str], video_dirs: List[str], one_way_video_dirs: List[str],
                           remote_data_base: str = "/media/mmchenry/ThumbDrive/",
                           remote_video_base: str = "/media/mmchenry/ThumbDrive/") -> None:
     """Create necessary directories on remote volumes and check for unsynced directories."""
-    
-    # Create data directories
-    for dir_name in data_dirs:
-        dir_path = os.path.join(remote_data_base, dir_name)
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-            print(f"Created directory: {dir_path}")
-
-    # Create video directories
-    for dir_name in video_dirs:
-        dir_path = os.path.join(remote_video_base, dir_name) 
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-            print(f"Created directory: {dir_path}")
-
-    # Create one-way video directories
-    for dir_name in one_way_video_dirs:
-        dir_path = os.path.join(remote_video_base, dir_name) 
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-            print(f"Created directory: {dir_path}")
+
+    # One scandir per base replaces a mkdir syscall per directory: only
+    # names missing from the listing are created, and the same scan is
+    # handed to check_unsynced_directories so on a slow USB mount each
+    # base is read exactly once at startup. The bases are fixed POSIX
+    # paths, so plain string concatenation beats os.path.join here; the
+    # set dedups the work when both bases point at the same mount.
+    scans = {base: _scan_dir_names(base) for base in {remote_data_base, remote_video_base}}
+
+    data_prefix = remote_data_base.rstrip("/") + "/"
+    video_prefix = remote_video_base.rstrip("/") + "/"
+    targets = {(remote_data_base, data_prefix, d) for d in data_dirs}
+    targets.update((remote_video_base, video_prefix, d)
+                   for d in (*video_dirs, *one_way_video_dirs))
+    missing = [f"{prefix}{dir_name}" for base, prefix, dir_name in targets
+               if scans[base] is None or dir_name not in scans[base]]
+
+    # Each mkdir on a USB/network mount is tens of ms of I/O wait, so the
+    # first-run case overlaps them in a small thread pool
+    if len(missing) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+            list(ex.map(lambda p: os.makedirs(p, exist_ok=True), missing))
+    elif missing:
+        os.makedirs(missing[0], exist_ok=True)
 
     # Check for directories in remote bases that are not included in sync lists
-    check_unsynced_directories(data_dirs, video_dirs, one_way_video_dirs, remote_data_base, remote_video_base)
+    check_unsynced_directories(data_dirs, video_dirs, one_way_video_dirs,
+                               remote_data_base, remote_video_base, scans=scans)
 
 
 def check_unsynced_directories(data_dirs: List[str], video_dirs: List[str], one_way_video_dirs: List[str],
                               remote_data_base: str = "/media/mmchenry/ThumbDrive/",
-                              remote_video_base: str = "/media/mmchenry/ThumbDrive/") -> None:
-    """Check for directories in remote bases that are not in data_dirs or video_dirs."""
-    
-    # Check data remote base
-    if os.path.exists(remote_data_base):
-        all_synced_dirs = set(data_dirs)
-        remote_dirs = []
-        
-        try:
-            remote_dirs = [d for d in os.listdir(remote_data_base) 
-                         if os.path.isdir(os.path.join(remote_data_base, d))]
-        except PermissionError:
-            print(f"Warning: Cannot access {remote_data_base} to check for unsynced directories")
-        else:
-            unsynced_dirs = [d for d in remote_dirs if d not in all_synced_dirs]
-            
-            if unsynced_dirs:
-                print("\n" + "="*60)
-                print("WARNING: Found directories in remote_data_base that are NOT included in sync:")
-                print("="*60)
-                for dir_name in unsynced_dirs:
-                    dir_path = os.path.join(remote_data_base, dir_name)
-                    print(f"  - {dir_name} ({dir_path})")
-                print("\nThese directories will NOT be synchronized.")
-                print("Add them to 'data_dirs' if they should be synced.")
-                print("="*60 + "\n")
-            else:
-                print("✓ All directories in remote_data_base are included in sync configuration")
-    
-    # Check video remote base
-    if os.path.exists(remote_video_base):
-        all_synced_dirs = set(video_dirs + one_way_video_dirs)
-        remote_dirs = []
-        
-        try:
-            remote_dirs = [d for d in os.listdir(remote_video_base) 
-                         if os.path.isdir(os.path.join(remote_video_base, d))]
-        except PermissionError:
-            print(f"Warning: Cannot access {remote_video_base} to check for unsynced directories")
+                              remote_video_base: str = "/media/mmchenry/ThumbDrive/",
+                              scans: Dict = None) -> None:
+    """Check for directories in remote bases that are not in data_dirs or video_dirs.
+
+    setup_sync_directories passes its startup scan through `scans` so the
+    bases are not re-listed; standalone callers leave it None.
+    """
+    if scans is None:
+        # The data and video bases are often the same mount; scan each base once
+        scans = {base: _scan_dir_names(base) for base in {remote_data_base, remote_video_base}}
+
+    checks = [
+        ("remote_data_base", remote_data_base, set(data_dirs),
+         "Add them to 'data_dirs' if they should be synced."),
+        ("remote_video_base", remote_video_base, set(video_dirs + one_way_video_dirs),
+         "Add them to 'video_dirs' or 'one_way_video_dirs' if they should be synced."),
+    ]
+
+    for label, base, all_synced_dirs, advice in checks:
+        remote_dirs = scans[base]
+        if remote_dirs is None:
+            continue
+
+        # Both sides are sets, so the unsynced names fall out of a single
+        # C-level difference instead of a membership test per entry
+        unsynced_dirs = remote_dirs - all_synced_dirs
+
+        if unsynced_dirs:
+            prefix = base.rstrip("/") + "/"
+            listing = "\n".join(f"  - {d} ({prefix}{d})" for d in sorted(unsynced_dirs))
+            sys.stdout.write(
+                f"\n{_WARNING_BANNER}"
+                f"WARNING: Found directories in {label} that are NOT included in sync:\n"
+                f"{_WARNING_BANNER}"
+                f"{listing}\n"
+                f"\nThese directories will NOT be synchronized.\n"
+                f"{advice}\n"
+                f"{_WARNING_BANNER}\n")
         else:
-            unsynced_dirs = [d for d in remote_dirs if d not in all_synced_dirs]
-            
-            if unsynced_dirs:
-                print("\n" + "="*60)
-                print("WARNING: Found directories in remote_video_base that are NOT included in sync:")
-                print("="*60)
-                for dir_name in unsynced_dirs:
-                    dir_path = os.path.join(remote_video_base, dir_name)
-                    print(f"  - {dir_name} ({dir_path})")
-                print("\nThese directories will NOT be synchronized.")
-                print("Add them to 'video_dirs' or 'one_way_video_dirs' if they should be synced.")
-                print("="*60 + "\n")
-            else:
-                print("✓ All directories in remote_video_base are included in sync configuration")
+            print(f"✓ All directories in {label} are included in sync configuration")
 
 
 class DataSyncManager:
-    def __init__(self, config_file: str = None, checksum_mode: bool = False):
+    def __init__(self, config_file: str = None, checksum_mode: bool = False,
+                 hash_algo: str = "xxh128"):
         """Initialize the DataSyncManager with configuration."""
         self.config_file = config_file or "sync_config.json"
         self.checksum_mode = checksum_mode
+        self.hash_algo = hash_algo
+        self.checksum_cache = None
+        self.use_fast_copy = False
+
+        # When > 1, each transfer pair is split into this many parallel
+        # rsync streams (pairs with --delete always run as one stream)
+        self.parallel_chunks = 1
+
+        # Fast-verify: compare our own (blake3/xxh128) digests instead of
+        # handing --checksum to rsync; set from the --fast-verify flag
+        self.fast_verify = False
+
+        # Merkle subtree summary (set up by create_sync_manager)
+        self.merkle_file = None
+        self._merkle = {}
+
+        # Base URL of an rsync daemon (rsync://host/module) standing in
+        # for the remote bases; daemon transfers skip the ssh/mount layer
+        # and accept socket tuning. None means plain path-to-path rsync.
+        self.daemon_url = None
+
+        # Recompress large gzip archives with --rsyncable before syncing,
+        # so incremental changes stay delta-transferable. Off by default;
+        # enabled with --rsyncable-archives.
+        self.rsyncable_archives = False
+        self._warned_rsyncable_no_cache = False
+
+        # Append-verify transfers for video pairs: recordings only grow
+        # their files, so rsync can resume from the destination tail after
+        # verifying it instead of re-reading the whole file. Off by
+        # default; enabled with --append-mode.
+        self.append_mode = False
+
+        # Use rsync delta transfer on the bidirectional video pairs.
+        # rsync defaults to whole-file on local paths, but for big video
+        # files edited in place, delta transfer only writes changed blocks.
+        self.video_delta_mode = True
+
+        # Keeps multi-line log blocks together when pairs run concurrently
+        self._log_lock = threading.Lock()
+
+        # Per-pair completion watermarks ({pair_name: epoch_seconds});
+        # loaded by load_config, guarded for the parallel sync path
+        self._last_sync = {}
+        self._marker_lock = threading.Lock()
+
+        # Request-scoped stat cache; the same path is often stat'd several
+        # times per sync (existence check, mtime compare, size compare).
+        # Cleared at the start of each top-level sync so results stay fresh.
+        self._stat_cache = {}
+
+        # Destination directories already ensured this process; the sync
+        # dirs are stable across runs, so one mkdir per directory suffices
+        self._ensured_dirs = set()
+
+        # (exists, is_dir) per path; each endpoint appears in two pairs
+        # (once per direction), so one stat answers both validations
+        self._path_cache = {}
         
         # Default values - will be overridden by create_sync_manager
         self.local_data_root = "/home/mmchenry/Documents/catfish_kinematics"
@@ -120,15 +396,35 @@ class DataSyncManager:
         self.remote_data_base = "/media/mmchenry/ThumbDrive/"
         self.remote_video_base = "/media/mmchenry/ThumbDrive/"
         
+        # Frozen pair table and cached root scans; populated by load_config
+        self._pairs_by_name = {}
+        self._root_scan = {}
+        self._sync_all_specialized = None
+        self._exclude_args = ()
+
         # Logging will be set up after remote paths are configured
         self.logger = None
+
+        # Cached locations derived from remote_data_base; refreshed by
+        # _finalize_paths once create_sync_manager assigns the real base
+        self._finalize_paths()
     
+    def _finalize_paths(self):
+        """Cache the config and log locations once the remote base is known.
+
+        setup_logging, load_config and save_config all need the same two
+        paths; building them once avoids repeated PurePath construction
+        (and matters when load_config runs per worker).
+        """
+        self._config_path = Path(self.remote_data_base, "syncing_scripts", self.config_file)
+        self._log_dir = Path(self.remote_data_base, "syncing_scripts", "logs")
+        self._last_sync_path = self._config_path.parent / "last_sync.json"
+
     def setup_logging(self):
         """Setup logging configuration."""
         # Try to use remote_data_base for logs, fall back to current directory if not available
-        log_dir = None
         if os.path.exists(self.remote_data_base):
-            log_dir = Path(self.remote_data_base) / "syncing_scripts" / "logs"
+            log_dir = self._log_dir
         else:
             # Fall back to current directory for logs
             log_dir = Path.cwd() / "logs"
@@ -157,104 +453,164 @@ class DataSyncManager:
             self.logger = logging.getLogger(__name__)
             self.logger.warning(f"Could not create log directory {log_dir}: {e}. Using console logging only.")
     
+    def _ensure_dir(self, path: str):
+        """os.makedirs(exist_ok=True), skipping directories already ensured."""
+        path = os.path.normpath(path)
+        if path in self._ensured_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._ensured_dirs.add(path)
+        self._path_cache[path] = (True, True)
+
+    def _stat(self, path: str) -> os.stat_result:
+        """os.stat through the request-scoped cache."""
+        result = self._stat_cache.get(path)
+        if result is None:
+            result = os.stat(path, follow_symlinks=False)
+            self._stat_cache[path] = result
+        return result
+
+    def _scan_subdirs(self, base: str):
+        """Return the set of subdirectory names under base, or None if unreadable."""
+        try:
+            with os.scandir(base) as it:
+                return {e.name for e in it if e.is_dir(follow_symlinks=False)}
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return None
+
     def load_config(self):
         """Load synchronization configuration from JSON file."""
         # Use remote_data_base for config file location
-        config_path = Path(self.remote_data_base) / "syncing_scripts" / self.config_file
-        
+        config_path = self._config_path
+
+        # Watermarks from the previous run live next to the config
+        self._last_sync_load()
+
         # Always generate sync pairs dynamically based on detected paths
         # This ensures the script works correctly on different systems
         sync_pairs = []
-        
+
+        # One scandir per root instead of a stat per configured subdir;
+        # pairs whose source directory is missing are skipped with a warning
+        self._root_scan = {
+            base: self._scan_subdirs(base)
+            for base in {self.local_data_root, self.local_video_root,
+                         self.remote_data_base, self.remote_video_base}
+        }
+
+        def _source_present(base, dir_name):
+            present = self._root_scan.get(base)
+            if present is not None and dir_name not in present:
+                self.logger.warning(
+                    f"Source directory missing; skipping pair: {base.rstrip('/')}/{dir_name}")
+                return False
+            return True
+
+        # The option templates and normalized bases are identical for every
+        # directory, so build them once instead of per loop iteration
+        base_opts = SAFE_OPTS
+        if self.checksum_mode:
+            base_opts += ("--checksum",)
+            # rsync >= 3.2 can verify with xxh3, an order of magnitude
+            # faster than its default MD5; only add when supported
+            if "xxh3" in rsync_caps():
+                base_opts += ("--checksum-choice=xxh3",)
+
+        # A bare path (no host: prefix, no rsync:// scheme) is a locally
+        # mounted filesystem - the usual ThumbDrive case. Delta-transfer
+        # there reads and hashes both copies just to move bytes already on
+        # the same machine; --whole-file skips it.
+        local_ends = (self.local_data_root, self.local_video_root,
+                      self.remote_data_base, self.remote_video_base)
+        whole_file = (("--whole-file",)
+                      if not self.daemon_url and all(":" not in p for p in local_ends)
+                      else ())
+        rsync_safe = base_opts + whole_file
+        rsync_delete = rsync_safe + ("--delete",)
+
+        # Delta transfer for large video files edited in place
+        delta = DELTA_OPTS if self.video_delta_mode else ()
+
+        # Append mode bolts verified tail-resume onto the video pairs
+        append = APPEND_OPTS if self.append_mode else ()
+        video_extra = delta + tuple(opt for opt in append if opt not in delta)
+
+        # Video pairs doing delta/append transfer are layered on the base
+        # *without* --whole-file, so the persisted argv never carries both
+        # it and --no-whole-file at once
+        if video_extra:
+            video_safe = base_opts + video_extra
+            video_delete = base_opts + ("--delete",) + video_extra
+        else:
+            video_safe = rsync_safe
+            video_delete = rsync_delete
+
+        data_remote_base = self.remote_data_base.rstrip("/")
+        data_local_base = self.local_data_root.rstrip("/")
+        video_remote_base = self.remote_video_base.rstrip("/")
+        video_local_base = self.local_video_root.rstrip("/")
+
         # Sync data directories bidirectionally (remote <-> local)
         for data_dir in self.data_dirs:
-            # Remote -> Local (NO deletion - safe sync)
-            rsync_options_safe = ["-av", "--progress", "--no-perms", "--no-group"]
-            if self.checksum_mode:
-                rsync_options_safe.append("--checksum")
-            
-            # Local -> Remote (WITH deletion - source deletions propagate)
-            rsync_options_with_delete = ["-av", "--delete", "--progress", "--no-perms", "--no-group"]
-            if self.checksum_mode:
-                rsync_options_with_delete.append("--checksum")
-            
-            # Normalize paths to avoid double slashes
-            remote_base = self.remote_data_base.rstrip("/")
-            local_base = self.local_data_root.rstrip("/")
-            
             # Remote -> Local (safe sync, no deletion)
-            sync_pairs.append({
-                "name": f"data_{data_dir}_to_local",
-                "source": f"{remote_base}/{data_dir}",
-                "destination": f"{local_base}/{data_dir}",
-                "enabled": True,
-                "rsync_options": rsync_options_safe
-            })
-            
+            if _source_present(self.remote_data_base, data_dir):
+                sync_pairs.append({
+                    "name": f"data_{data_dir}_to_local",
+                    "source": f"{data_remote_base}/{data_dir}",
+                    "destination": f"{data_local_base}/{data_dir}",
+                    "enabled": True,
+                    "rsync_options": list(rsync_safe)
+                })
+
             # Local -> Remote (with deletion - source deletions propagate)
-            sync_pairs.append({
-                "name": f"data_{data_dir}_to_remote",
-                "source": f"{local_base}/{data_dir}",
-                "destination": f"{remote_base}/{data_dir}",
-                "enabled": True,
-                "rsync_options": rsync_options_with_delete
-            })
+            if _source_present(self.local_data_root, data_dir):
+                sync_pairs.append({
+                    "name": f"data_{data_dir}_to_remote",
+                    "source": f"{data_local_base}/{data_dir}",
+                    "destination": f"{data_remote_base}/{data_dir}",
+                    "enabled": True,
+                    "rsync_options": list(rsync_delete)
+                })
         
         # Sync video directories bidirectionally (remote <-> local)
         for video_dir in self.video_dirs:
-            # Remote -> Local (NO deletion - safe sync)
-            rsync_options_safe = ["-av", "--progress", "--no-perms", "--no-group"]
-            if self.checksum_mode:
-                rsync_options_safe.append("--checksum")
-            
-            # Local -> Remote (WITH deletion - source deletions propagate)
-            rsync_options_with_delete = ["-av", "--delete", "--progress", "--no-perms", "--no-group"]
-            if self.checksum_mode:
-                rsync_options_with_delete.append("--checksum")
-            
-            # Normalize paths to avoid double slashes
-            remote_base = self.remote_video_base.rstrip("/")
-            local_base = self.local_video_root.rstrip("/")
-            
             # Remote -> Local (safe sync, no deletion)
-            sync_pairs.append({
-                "name": f"video_{video_dir}_to_local",
-                "source": f"{remote_base}/{video_dir}",
-                "destination": f"{local_base}/{video_dir}",
-                "enabled": True,
-                "rsync_options": rsync_options_safe
-            })
-            
+            if _source_present(self.remote_video_base, video_dir):
+                sync_pairs.append({
+                    "name": f"video_{video_dir}_to_local",
+                    "source": f"{video_remote_base}/{video_dir}",
+                    "destination": f"{video_local_base}/{video_dir}",
+                    "enabled": True,
+                    "rsync_options": list(video_safe)
+                })
+
             # Local -> Remote (with deletion - source deletions propagate)
-            sync_pairs.append({
-                "name": f"video_{video_dir}_to_remote",
-                "source": f"{local_base}/{video_dir}",
-                "destination": f"{remote_base}/{video_dir}",
-                "enabled": True,
-                "rsync_options": rsync_options_with_delete
-            })
+            if _source_present(self.local_video_root, video_dir):
+                sync_pairs.append({
+                    "name": f"video_{video_dir}_to_remote",
+                    "source": f"{video_local_base}/{video_dir}",
+                    "destination": f"{video_remote_base}/{video_dir}",
+                    "enabled": True,
+                    "rsync_options": list(video_delete)
+                })
         
-        # Sync one-way video directories (local -> remote only)
+        # Sync one-way video directories (local -> remote only; no --delete)
+        oneway_opts = base_opts + append if append else rsync_safe
         for video_dir in self.one_way_video_dirs:
-            rsync_options = ["-av", "--progress", "--no-perms", "--no-group"]  # No --delete for one-way sync
-            if self.checksum_mode:
-                rsync_options.append("--checksum")
-            # Normalize paths to avoid double slashes
-            remote_base = self.remote_video_base.rstrip("/")
-            local_base = self.local_video_root.rstrip("/")
-            sync_pairs.append({
-                "name": f"video_{video_dir}_oneway",
-                "source": f"{local_base}/{video_dir}",
-                "destination": f"{remote_base}/{video_dir}",
-                "enabled": True,
-                "rsync_options": rsync_options,
-                "description": "One-way sync: local -> remote only"
-            })
+            if _source_present(self.local_video_root, video_dir):
+                sync_pairs.append({
+                    "name": f"video_{video_dir}_oneway",
+                    "source": f"{video_local_base}/{video_dir}",
+                    "destination": f"{video_remote_base}/{video_dir}",
+                    "enabled": True,
+                    "rsync_options": list(oneway_opts),
+                    "description": "One-way sync: local -> remote only"
+                })
         
         # Default configuration with dynamic paths
         self.config = {
             "sync_pairs": sync_pairs,
-            "global_rsync_options": ["-av", "--progress"],
+            "global_rsync_options": ["-a", "--info=progress2,stats2"],
             "exclude_patterns": [
                 "*.tmp",
                 "*.log",
@@ -266,11 +622,10 @@ class DataSyncManager:
         }
         
         # Load user overrides from config file (but don't override the paths)
-        config_path = Path(self.remote_data_base) / "syncing_scripts" / self.config_file
         if config_path.exists():
             try:
-                with open(config_path, 'r') as f:
-                    user_config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    user_config = _json_load_bytes(f.read())
                     # Only update non-path related settings
                     if "global_rsync_options" in user_config:
                         self.config["global_rsync_options"] = user_config["global_rsync_options"]
@@ -286,6 +641,42 @@ class DataSyncManager:
             except Exception as e:
                 self.logger.warning(f"Could not load config file: {e}. Using defaults.")
         
+        # Pre-assemble the exclude arguments once; build_rsync_command runs
+        # per pair and would otherwise re-iterate the pattern list each time
+        self._exclude_args = tuple(
+            arg for pattern in self.config["exclude_patterns"]
+            for arg in ("--exclude", pattern))
+
+        # Better still: write the patterns to a file next to the config so
+        # every rsync takes one --exclude-from argument instead of ~12
+        # argv entries re-parsed per invocation. The per-pattern tuple
+        # above remains the fallback when the drive is not writable.
+        exclude_file = self._config_path.parent / "rsync_excludes.txt"
+        try:
+            with open(exclude_file, 'w') as f:
+                f.write("\n".join(self.config["exclude_patterns"]) + "\n")
+            self._exclude_args = (f"--exclude-from={exclude_file}",)
+        except OSError as e:
+            self.logger.warning(f"Could not write exclude file: {e}")
+
+        # Freeze the pair table for O(1) lookups by name
+        self._pairs_by_name = {pair["name"]: pair for pair in self.config["sync_pairs"]}
+
+        # Partial evaluation of the dispatch loop: for a fixed configuration
+        # the pair sequence never changes, so generate a method body with the
+        # enabled pair names inlined. The serial sync_all path then skips the
+        # per-pair list iteration and enabled checks entirely.
+        src_lines = ["def _sync_all_specialized(self, dry_run=False):",
+                     "    n = 0"]
+        for pair in self.config["sync_pairs"]:
+            if pair.get("enabled", True):
+                src_lines.append(
+                    f"    n += 1 if self.sync_pair(self._pairs_by_name[{pair['name']!r}], dry_run) else 0")
+        src_lines.append("    return n")
+        ns = {}
+        exec("\n".join(src_lines), ns)
+        self._sync_all_specialized = ns["_sync_all_specialized"].__get__(self)
+
         # Always save the current configuration with detected paths
         self.save_config()
         mode = "checksum" if self.checksum_mode else "timestamp"
@@ -297,34 +688,72 @@ class DataSyncManager:
         self.logger.info(f"Sync mode: {mode} comparison")
     
     def save_config(self):
-        """Save current configuration to JSON file."""
-        config_path = Path(self.remote_data_base) / "syncing_scripts" / self.config_file
+        """Save current configuration to JSON file.
+
+        The config is regenerated on every run but rarely changes, so the
+        serialized bytes are compared with the on-disk file first and the
+        synchronous thumb-drive write is skipped when identical. Actual
+        writes go through a temp file and os.replace so a yanked drive
+        cannot leave a half-written config behind.
+        """
+        config_path = self._config_path
         try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            data = _json_dump_bytes(self.config)
+            try:
+                with open(config_path, 'rb') as f:
+                    if f.read() == data:
+                        self.logger.info(f"Configuration unchanged: {config_path}")
+                        return
+            except OSError:
+                pass
+            tmp_path = f"{config_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, config_path)
             self.logger.info(f"Configuration saved to {config_path}")
         except Exception as e:
             self.logger.error(f"Could not save configuration: {e}")
     
+    def _cached_path_info(self, path: str) -> Tuple[bool, bool]:
+        """Return (exists, is_dir) for path from a single cached stat."""
+        info = self._path_cache.get(path)
+        if info is None:
+            try:
+                st = os.stat(path)
+                info = (True, stat.S_ISDIR(st.st_mode))
+            except OSError:
+                info = (False, False)
+            self._path_cache[path] = info
+        return info
+
     def validate_paths(self, source: str, destination: str) -> Tuple[bool, str]:
-        """Validate that source and destination paths exist and are accessible."""
-        source_path = Path(source)
-        dest_path = Path(destination)
-        
-        if not source_path.exists():
-            return False, f"Source path does not exist: {source}"
-        
-        if not source_path.is_dir():
-            return False, f"Source path is not a directory: {source}"
-        
+        """Validate that source and destination paths exist and are accessible.
+
+        The second direction of each bidirectional pair revisits the same
+        two endpoints, so the answers come from the cached stats.
+        Daemon-served endpoints are not on a local mount - the drive is
+        typically not even attached here - so the daemon is left to
+        validate its own module paths.
+        """
+        if not self._is_daemon_endpoint(source):
+            exists, is_dir = self._cached_path_info(source)
+            if not exists:
+                return False, f"Source path does not exist: {source}"
+
+            if not is_dir:
+                return False, f"Source path is not a directory: {source}"
+
         # Check if destination parent directory exists
-        if not dest_path.parent.exists():
-            try:
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                self.logger.info(f"Created destination directory: {dest_path.parent}")
-            except Exception as e:
-                return False, f"Cannot create destination directory: {e}"
-        
+        if not self._is_daemon_endpoint(destination):
+            dest_parent = os.path.dirname(destination.rstrip("/"))
+            exists, _ = self._cached_path_info(dest_parent)
+            if not exists:
+                try:
+                    self._ensure_dir(dest_parent)
+                    self.logger.info(f"Created destination directory: {dest_parent}")
+                except Exception as e:
+                    return False, f"Cannot create destination directory: {e}"
+
         return True, "OK"
     
     def build_rsync_command(self, source: str, destination: str, 
@@ -334,64 +763,530 @@ class DataSyncManager:
         
         # Add specific options for this sync pair (these already include global options)
         cmd.extend(rsync_options)
-        
-        # Add verbose output to show what files are being checked/transferred
-        if "-v" not in rsync_options and "--verbose" not in rsync_options:
-            cmd.append("-v")
-        
-        # Add stats to show detailed transfer statistics
-        if "--stats" not in rsync_options:
-            cmd.append("--stats")
-        
-        # Add itemize-changes to show detailed file information (what changed)
+
+        # Itemize-changes gives one compact line per changed file; it is
+        # also what sync_pair and plan_all parse
         if "--itemize-changes" not in rsync_options:
             cmd.append("--itemize-changes")
-        
-        # Add exclude patterns
-        for pattern in self.config.get("exclude_patterns", []):
-            cmd.extend(["--exclude", pattern])
+
+        # Per-file verbose/progress lines dominate stdout volume on big
+        # trees, and Python decodes and re-logs every one of them. A
+        # single rolling progress2 line serves a human at a TTY; without
+        # one even that is dropped. STATS2 keeps the summary block the
+        # parsers read, FLIST0/MISC0 silence the rest, and the itemize
+        # lines requested above are unaffected by dropping -v.
+        if "--progress" in cmd:
+            cmd.remove("--progress")
+        if sys.stdout.isatty():
+            # progress2 percentages are only meaningful with the full
+            # file list known up front
+            cmd.extend(["--info=progress2,stats2,flist0,misc0", "--no-inc-recursive"])
+        else:
+            cmd.append("--info=STATS2,FLIST0,MISC0")
+
+        # Add exclude patterns (pre-assembled in load_config)
+        cmd.extend(self._exclude_args)
         
         # Add dry run option
         if dry_run:
             cmd.append("--dry-run")
         
-        # Normalize paths to avoid double slashes
-        source_normalized = source.rstrip("/") + "/"
-        destination_normalized = destination.rstrip("/")
-        
+        # Normalize paths to avoid double slashes; remote-base endpoints
+        # are rewritten to the daemon URL when one is configured
+        source_normalized = self._map_daemon(source.rstrip("/")) + "/"
+        destination_normalized = self._map_daemon(destination.rstrip("/"))
+
+        # Daemon transfers ride a real network socket, where big buffers
+        # keep a high-latency link full
+        if source_normalized.startswith("rsync://") or destination_normalized.startswith("rsync://"):
+            cmd.append("--sockopts=SO_SNDBUF=4194304,SO_RCVBUF=4194304")
+
         # Add source and destination
         cmd.extend([source_normalized, destination_normalized])
         
         return cmd
     
-    def run_rsync(self, source: str, destination: str, rsync_options: List[str], 
+    def _map_daemon(self, path: str) -> str:
+        """Rewrite a remote-base path to its rsync daemon URL, if configured."""
+        if not self.daemon_url:
+            return path
+        for base in (self.remote_data_base, self.remote_video_base):
+            base = base.rstrip("/")
+            # Exact-or-child match only; a bare prefix test would also
+            # claim sibling mounts like ThumbDrive2
+            if path == base or path.startswith(base + "/"):
+                return self.daemon_url.rstrip("/") + path[len(base):]
+        return path
+
+    def _is_daemon_endpoint(self, path: str) -> bool:
+        """True when path is served by the rsync daemon rather than a local mount."""
+        return self.daemon_url is not None and self._map_daemon(path) != path
+
+    def run_rsync(self, source: str, destination: str, rsync_options: List[str],
                   dry_run: bool = False) -> Tuple[bool, str]:
-        """Execute rsync command and return success status and output."""
+        """Execute rsync, streaming its output line by line.
+
+        Buffering the whole transcript (capture_output=True) holds tens of
+        MB in memory on big trees and shows nothing until rsync exits.
+        Streaming keeps memory at one line, surfaces progress live, and
+        retains every itemize line plus a 200-line tail of the rest for
+        the post-run parsing in sync_pair and plan_all.
+        """
         cmd = self.build_rsync_command(source, destination, rsync_options, dry_run)
-        
-        self.logger.info(f"Running command: {' '.join(cmd)}")
-        
+
+        # Lazy %-formatting defers the join until a handler actually emits
+        self.logger.info("Running command: %s", shlex.join(cmd))
+
         try:
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                check=True
+            # close_fds=False skips the pre-exec walk over inherited fds
+            # (they are O_CLOEXEC anyway); start_new_session keeps a ctrl-C
+            # at the console from killing rsync before we can reap it
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                close_fds=False,
+                pass_fds=(),
+                start_new_session=True
             )
-            
-            output = result.stdout
-            if result.stderr:
-                output += f"\nStderr: {result.stderr}"
-            
-            return True, output
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = f"rsync failed with return code {e.returncode}: {e.stderr}"
-            return False, error_msg
         except Exception as e:
-            error_msg = f"Unexpected error running rsync: {e}"
+            return False, f"Unexpected error running rsync: {e}"
+
+        # Drain stderr on a helper thread so a full pipe can't stall rsync
+        stderr_lines = []
+
+        def _drain_stderr():
+            for line in proc.stderr:
+                stderr_lines.append(line.rstrip("\n"))
+
+        stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+        stderr_thread.start()
+
+        # Itemize lines are collected in full (one short string per
+        # changed file) because plan_all and the post-run summary count
+        # them; everything else - progress, stats - goes through a
+        # bounded tail so a huge transcript cannot pile up in memory
+        itemized = []
+        tail = collections.deque(maxlen=200)
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line:
+                self.logger.info(line)
+                if line.strip().startswith(_CHANGE_PREFIXES):
+                    itemized.append(line)
+                else:
+                    tail.append(line)
+
+        proc.stdout.close()
+        returncode = proc.wait()
+        stderr_thread.join()
+
+        if returncode != 0:
+            error_msg = f"rsync failed with return code {returncode}: " + "\n".join(stderr_lines)
             return False, error_msg
+
+        output = "\n".join(itemized + list(tail))
+        if stderr_lines:
+            output += "\nStderr: " + "\n".join(stderr_lines)
+
+        return True, output
     
+    def _tree_digest(self, base: str) -> str:
+        """Compute a Merkle-style root digest for a whole subtree.
+
+        Files are digested through the persistent checksum cache, so after
+        the first pass an unchanged tree costs one stat per file rather
+        than a full read. Matching roots on both sides of a pair prove the
+        subtrees identical without running rsync at all.
+        """
+        h = _new_hasher(self.hash_algo)
+        for root, dirs, files in os.walk(base):
+            dirs.sort()
+            for fname in sorted(files):
+                # walk roots never end in a separator, so plain
+                # concatenation skips os.path.join overhead per file
+                path = f"{root}/{fname}"
+                try:
+                    digest = hash_file_cached(path, self.checksum_cache, self.hash_algo)
+                except OSError:
+                    continue
+                h.update(f"{os.path.relpath(path, base)}\0{digest}\n".encode())
+        return h.hexdigest()
+
+    def _source_is_local(self, path: str) -> bool:
+        """True when path lies under one of this machine's local roots.
+
+        The watermark skip is only sound for trees this machine writes
+        itself. The to_local pairs read the shared drive, which the
+        other machine fills with rsync -a and preserved (often old)
+        mtimes, so "nothing newer than the watermark" there does not
+        mean "nothing new".
+        """
+        for base in (self.local_data_root, self.local_video_root):
+            base = base.rstrip("/")
+            if path == base or path.startswith(base + "/"):
+                return True
+        return False
+
+    def _last_sync_load(self):
+        """Load per-pair sync watermarks from the previous run."""
+        try:
+            with open(self._last_sync_path, 'rb') as f:
+                self._last_sync = _json_load_bytes(f.read())
+        except (OSError, ValueError):
+            self._last_sync = {}
+
+    def _last_sync_save(self):
+        """Persist the per-pair sync watermarks."""
+        try:
+            with open(self._last_sync_path, 'wb') as f:
+                f.write(_json_dump_bytes(self._last_sync))
+        except OSError as e:
+            self.logger.warning(f"Could not save last-sync markers: {e}")
+
+    def _tree_changed_since(self, base: str, watermark: float) -> bool:
+        """True when anything under base has an mtime newer than watermark.
+
+        An explicit scandir stack short-circuits at the first newer entry,
+        so a dirty tree answers almost immediately and an idle one costs a
+        metadata-only pass - far cheaper than a full rsync scan. Deletions
+        bump the parent directory's mtime, so they dirty the tree too.
+        """
+        stack = [base]
+        while stack:
+            current = stack.pop()
+            try:
+                if os.stat(current).st_mtime > watermark:
+                    return True
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.stat(follow_symlinks=False).st_mtime > watermark:
+                                return True
+                        except OSError:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                # Unreadable subtree: assume changed so rsync takes a look
+                return True
+        return False
+
+    def _merkle_save(self):
+        """Persist the subtree roots recorded this run."""
+        try:
+            with open(self.merkle_file, 'w') as f:
+                json.dump(self._merkle, f, indent=2)
+        except OSError as e:
+            self.logger.warning(f"Could not save Merkle summary: {e}")
+
+    def _merkle_load(self):
+        """Load subtree roots from the previous run, if any."""
+        try:
+            with open(self.merkle_file, 'r') as f:
+                self._merkle = json.load(f)
+        except (OSError, ValueError):
+            self._merkle = {}
+
+    def _profile_tree(self, source: str) -> Tuple[int, int, int]:
+        """Return (n_files, total_bytes, median_size) for a source tree."""
+        sizes = []
+        for root, dirs, files in os.walk(source):
+            for fname in files:
+                try:
+                    st = self._stat(f"{root}/{fname}")
+                except OSError:
+                    continue
+                sizes.append(st.st_size)
+        if not sizes:
+            return 0, 0, 0
+        sizes.sort()
+        return len(sizes), sum(sizes), sizes[len(sizes) // 2]
+
+    def _estimate_transfer(self, source: str, destination: str,
+                           rsync_options: List[str]) -> int:
+        """Estimate bytes rsync would transfer with a --stats dry run.
+
+        Returns -1 when no estimate is available (rsync error or an
+        unparseable stats block); callers treat that as "skip the
+        preflight" rather than a failure.
+        """
+        cmd = ["rsync"]
+        cmd.extend(rsync_options)
+        cmd.extend(["--dry-run", "--stats"])
+        if "--progress" in cmd:
+            cmd.remove("--progress")
+        cmd.extend(self._exclude_args)
+        cmd.extend([source.rstrip("/") + "/", destination.rstrip("/")])
+        self.logger.info("Estimating transfer size: %s", shlex.join(cmd))
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except Exception:
+            return -1
+        if result.returncode != 0:
+            return -1
+        match = re.search(r"Total transferred file size: ([\d,]+) bytes", result.stdout)
+        if match is None:
+            return -1
+        return int(match.group(1).replace(",", ""))
+
+    def _checksum_diff_list(self, source: str, destination: str) -> Tuple[List[str], int]:
+        """Relative paths whose cached digests differ between the two sides.
+
+        Both trees hash through the persistent checksum cache, so after
+        the first pass a steady-state run costs one stat per file. The
+        result feeds --files-from, letting rsync examine only files known
+        to differ instead of re-hashing everything under --checksum.
+        """
+        diffs = []
+        scanned = 0
+        src_prefix = source.rstrip("/") + "/"
+        dst_prefix = destination.rstrip("/") + "/"
+        for root, dirs, files in os.walk(src_prefix):
+            rel_root = os.path.relpath(root, src_prefix)
+            for fname in files:
+                rel = fname if rel_root == "." else f"{rel_root}/{fname}"
+                try:
+                    src_digest = hash_file_cached(
+                        f"{src_prefix}{rel}", self.checksum_cache, self.hash_algo)
+                except OSError:
+                    continue
+                scanned += 1
+                try:
+                    dst_digest = hash_file_cached(
+                        f"{dst_prefix}{rel}", self.checksum_cache, self.hash_algo)
+                except OSError:
+                    dst_digest = None
+                if src_digest != dst_digest:
+                    diffs.append(rel)
+        return diffs, scanned
+
+    def _recompress_archives(self, source: str) -> None:
+        """Recompress large gzip archives under source with --rsyncable.
+
+        Ordinary gzip output scrambles every byte after a change, which
+        defeats rsync's delta algorithm; --rsyncable restarts the
+        compressor periodically (<1% size cost) so local edits stay
+        local. Finished files are recorded in the checksum-cache sidecar
+        keyed by size and mtime, so each archive is rewritten only when
+        its content changes.
+        """
+        if self.checksum_cache is None and not self._warned_rsyncable_no_cache:
+            self._warned_rsyncable_no_cache = True
+            self.logger.warning(
+                "No checksum cache configured; archives will be recompressed "
+                "on every run instead of once per content change")
+        threshold = 100 << 20
+        for root, dirs, files in os.walk(source):
+            for fname in files:
+                if not fname.endswith(".gz"):
+                    continue
+                path = f"{root}/{fname}"
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if st.st_size < threshold:
+                    continue
+                if (self.checksum_cache is not None
+                        and self.checksum_cache.is_rsyncable(path, st.st_size, st.st_mtime_ns)):
+                    continue
+                tmp = path + ".rsyncable"
+                try:
+                    with open(tmp, 'wb') as out:
+                        gunzip = subprocess.Popen(["gzip", "-dc", path],
+                                                  stdout=subprocess.PIPE)
+                        gzip_r = subprocess.Popen(["gzip", "--rsyncable"],
+                                                  stdin=gunzip.stdout, stdout=out)
+                        gunzip.stdout.close()
+                        extract_rc = gzip_r.wait()
+                        read_rc = gunzip.wait()
+                    if read_rc or extract_rc:
+                        raise OSError(f"gzip pipe failed (rc={read_rc}/{extract_rc})")
+                    os.replace(tmp, path)
+                except (OSError, subprocess.SubprocessError) as e:
+                    self.logger.warning(f"Could not recompress {path}: {e}")
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    continue
+                if self.checksum_cache is not None:
+                    st = os.stat(path)
+                    self.checksum_cache.mark_rsyncable(path, st.st_size, st.st_mtime_ns)
+                self.logger.info(f"Recompressed with --rsyncable: {path}")
+
+    def _dir_is_empty(self, path: str) -> bool:
+        """True when the directory is missing or has no entries."""
+        try:
+            with os.scandir(path) as it:
+                return next(iter(it), None) is None
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+    def _tar_pipe_copy(self, source: str, destination: str) -> Tuple[bool, str]:
+        """Transfer a tree through a tar pipe.
+
+        For directories of many small files, rsync pays per-file setup
+        costs that dominate the transfer; a single streaming tar pipe
+        amortizes the open/close syscalls across the whole tree.
+        """
+        self._ensure_dir(destination)
+        src_tar = subprocess.Popen(["tar", "-C", source, "-cf", "-", "."],
+                                   stdout=subprocess.PIPE)
+        dst_tar = subprocess.Popen(["tar", "-C", destination, "-xf", "-"],
+                                   stdin=src_tar.stdout)
+        src_tar.stdout.close()
+        dst_rc = dst_tar.wait()
+        src_rc = src_tar.wait()
+        if src_rc or dst_rc:
+            return False, f"tar pipe failed (create rc={src_rc}, extract rc={dst_rc})"
+        return True, "tar pipe transfer complete"
+
+    def _bulk_copy_tree(self, source: str, destination: str) -> Tuple[bool, str]:
+        """Linux fast path for local-to-local bulk copies of large files.
+
+        Skips the rsync subprocess and copies changed files directly with
+        os.copy_file_range, which moves data inside the kernel without
+        round-tripping through userspace buffers. Files are visited in
+        inode order so reads stay roughly sequential on disk. Only files
+        whose size or mtime differ from the destination are copied;
+        deletions are not handled here (those pairs stay on rsync).
+        """
+        copied = 0
+        skipped = 0
+        entries = []
+
+        for root, dirs, files in os.walk(source):
+            rel = os.path.relpath(root, source)
+            dst_root = destination if rel == "." else f"{destination}/{rel}"
+            self._ensure_dir(dst_root)
+            for fname in files:
+                src_file = f"{root}/{fname}"
+                st = self._stat(src_file)
+                entries.append((st.st_ino, src_file, f"{dst_root}/{fname}", st))
+
+        # Inode order approximates on-disk layout for sequential reads
+        entries.sort()
+
+        for _, src_file, dst_file, st in entries:
+            try:
+                dst_st = os.stat(dst_file)
+                if dst_st.st_size == st.st_size and int(dst_st.st_mtime) >= int(st.st_mtime):
+                    skipped += 1
+                    continue
+            except FileNotFoundError:
+                pass
+
+            try:
+                with open(src_file, 'rb') as fsrc, open(dst_file, 'wb') as fdst:
+                    remaining = st.st_size
+                    while remaining > 0:
+                        n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if n == 0:
+                            break
+                        remaining -= n
+                os.utime(dst_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+                copied += 1
+            except OSError as e:
+                return False, f"Bulk copy failed at {src_file}: {e}"
+
+        return True, f"Bulk copy: {copied} file(s) copied, {skipped} unchanged"
+
+    def run_rsync_chunked(self, source: str, destination: str,
+                          rsync_options: List[str], n_chunks: int = 4) -> Tuple[bool, str]:
+        """Split one pair's files into balanced buckets and run N rsyncs.
+
+        A single rsync transfers serially; on a slow link one stream cannot
+        saturate bandwidth. This enumerates the pending files with a dry
+        run, packs them largest-first into n_chunks buckets (LPT
+        scheduling), and runs one rsync per bucket concurrently with
+        --files-from. Pairs that use --delete are not chunked, since
+        deletions cannot safely run in parallel.
+        """
+        # Phase 1: enumerate pending files with their sizes
+        list_cmd = ["rsync", "-rn", "--out-format=%l %n"]
+        list_cmd.extend(opt for opt in rsync_options if opt not in ("-av", "--progress"))
+        list_cmd.append("-a")
+        list_cmd.extend(self._exclude_args)
+        list_cmd.extend([source.rstrip("/") + "/", destination.rstrip("/")])
+
+        try:
+            result = subprocess.run(list_cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            return False, f"rsync file enumeration failed: {e.stderr}"
+
+        files = []
+        for line in result.stdout.splitlines():
+            parts = line.strip().split(None, 1)
+            if len(parts) != 2 or parts[1].endswith("/"):
+                continue
+            try:
+                files.append((int(parts[0]), parts[1]))
+            except ValueError:
+                continue
+
+        if not files:
+            return True, "No files needed transfer"
+        if len(files) < n_chunks * 2:
+            # Too few files to be worth the extra processes
+            return self.run_rsync(source, destination, rsync_options)
+
+        # Phase 2: largest-first bin packing into n_chunks buckets
+        files.sort(reverse=True)
+        buckets = [(0, i, []) for i in range(n_chunks)]
+        heapq.heapify(buckets)
+        for size, path in files:
+            total, i, bucket = heapq.heappop(buckets)
+            bucket.append(path)
+            heapq.heappush(buckets, (total + size, i, bucket))
+
+        # Phase 3: one rsync per bucket, run concurrently
+        procs = []
+        tmp_files = []
+        try:
+            for _total, _i, bucket in buckets:
+                if not bucket:
+                    continue
+                tmp = tempfile.NamedTemporaryFile(
+                    mode='w', prefix="sync_bucket_", suffix=".txt", delete=False)
+                tmp.write("\n".join(bucket) + "\n")
+                tmp.close()
+                tmp_files.append(tmp.name)
+
+                cmd = ["rsync"]
+                cmd.extend(opt for opt in rsync_options if opt != "--progress")
+                cmd.extend(self._exclude_args)
+                cmd.extend([f"--files-from={tmp.name}",
+                            source.rstrip("/") + "/", destination.rstrip("/")])
+                procs.append(subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, close_fds=False, pass_fds=(),
+                    start_new_session=True))
+
+            outputs = []
+            failed = False
+            for proc in procs:
+                out, _ = proc.communicate()
+                outputs.append(out or "")
+                if proc.returncode != 0:
+                    failed = True
+        finally:
+            for name in tmp_files:
+                try:
+                    os.unlink(name)
+                except OSError:
+                    pass
+
+        output = "\n".join(outputs)
+        if failed:
+            return False, f"chunked rsync failed: {output}"
+        return True, output
+
     def sync_pair(self, pair: Dict, dry_run: bool = False) -> bool:
         """Synchronize a single source-destination pair."""
         name = pair["name"]
@@ -400,114 +1295,499 @@ class DataSyncManager:
         rsync_options = pair.get("rsync_options", [])
         
         self.logger.info(f"Starting sync for '{name}': {source} -> {destination}")
+        sync_started = time.time()
         
         # Validate paths
         is_valid, error_msg = self.validate_paths(source, destination)
         if not is_valid:
             self.logger.error(f"Validation failed for '{name}': {error_msg}")
             return False
-        
-        # Run rsync
-        success, output = self.run_rsync(source, destination, rsync_options, dry_run)
-        
+
+        # Every fast path below stats, walks or hashes the endpoints as
+        # local filesystem trees; a daemon-served endpoint has no local
+        # tree to inspect, so such pairs go straight to rsync
+        daemon_pair = (self._is_daemon_endpoint(source)
+                       or self._is_daemon_endpoint(destination))
+
+        # Merkle short-circuit (checksum mode only - in timestamp mode
+        # hashing both trees would cost more than the rsync it replaces):
+        # when the fresh source digest still matches the roots persisted
+        # after the last successful sync, the pair is in sync without
+        # touching the destination tree at all. Digests come from the
+        # checksum cache, so this is stat-bound on re-runs.
+        if (self.merkle_file and self.checksum_mode and not dry_run
+                and not daemon_pair and self.checksum_cache is not None):
+            src_root = self._tree_digest(source)
+            prev_src = self._merkle.get(source)
+            prev_dst = self._merkle.get(destination)
+            if src_root == prev_src and prev_src == prev_dst:
+                self.logger.info(f"'{name}' matches persisted subtree roots - skipping rsync")
+                return True
+            dst_root = self._tree_digest(destination)
+            if src_root == dst_root:
+                self._merkle[source] = src_root
+                self._merkle[destination] = dst_root
+                self._merkle_save()
+                self.logger.info(f"'{name}' subtree digests match - skipping rsync")
+                return True
+
+        # Watermark skip: when nothing under the source is newer than this
+        # pair's last successful sync, the whole rsync scan is redundant.
+        # Turns a no-op run into a sub-second metadata walk. Only applied
+        # to locally-written sources - see _source_is_local.
+        if not dry_run and self._source_is_local(source):
+            marker = self._last_sync.get(name)
+            if marker is not None and not self._tree_changed_since(source, marker):
+                self.logger.info(f"'{name}' unchanged since last sync - skipping rsync")
+                return True
+
+        # Rewrite big gzip archives into rsync-friendly form before the
+        # transfer looks at them
+        if (self.rsyncable_archives and not dry_run
+                and not self._is_daemon_endpoint(source)):
+            self._recompress_archives(source)
+
+        # An empty source has nothing to transfer; skip the process spawn
+        # (and, for --delete pairs, an accidental wipe of the destination)
+        if not self._is_daemon_endpoint(source) and self._dir_is_empty(source):
+            self.logger.info(f"Source empty; skipping rsync for '{name}'")
+            return True
+
+        # With nothing at the destination to compare against, rsync must
+        # copy everything regardless, so hashing both sides first is pure
+        # waste; drop --checksum for this invocation only
+        if ("--checksum" in rsync_options
+                and not self._is_daemon_endpoint(destination)
+                and self._dir_is_empty(destination)):
+            rsync_options = [opt for opt in rsync_options
+                             if opt != "--checksum"
+                             and not opt.startswith("--checksum-choice")]
+            self.logger.info(f"Destination empty; bypassing --checksum for '{name}'")
+
+        # Pre-flight: a cheap dry-run estimate catches "destination out of
+        # space" before rsync copies gigabytes and dies midway. The 10%
+        # margin covers filesystem overhead; the estimate is cached on the
+        # pair so repeat syncs within a run do not re-scan.
+        if not dry_run and not self._is_daemon_endpoint(destination):
+            estimate = pair.get("_est_bytes")
+            if estimate is None:
+                estimate = self._estimate_transfer(source, destination, rsync_options)
+                pair["_est_bytes"] = estimate
+            if estimate > 0:
+                try:
+                    free = shutil.disk_usage(destination).free
+                except OSError:
+                    free = shutil.disk_usage(os.path.dirname(destination.rstrip("/"))).free
+                if free < estimate * 1.1:
+                    self.logger.error(
+                        f"Insufficient space for '{name}': needs ~{estimate} bytes "
+                        f"plus margin, only {free} free at destination")
+                    return False
+
+        # Tar-pipe fast path for trees of many small files (e.g. mean_images,
+        # matlab_data) into an empty destination. Skipped in checksum mode,
+        # which needs per-file hashing, and on incremental runs where rsync's
+        # change detection earns its keep.
+        if (not dry_run and not self.checksum_mode and not daemon_pair
+                and self._dir_is_empty(destination)):
+            n_files, total_bytes, median_size = self._profile_tree(source)
+            # Many small files is exactly where rsync's per-file protocol
+            # overhead dominates; a typical median keeps big-video trees
+            # (few huge files) on rsync where resume matters
+            if n_files > 5000 and median_size < (64 << 10):
+                success, message = self._tar_pipe_copy(source, destination)
+                if success:
+                    self.logger.info(f"'{name}': {message} ({n_files} files)")
+                    return True
+                self.logger.warning(f"'{name}': {message} - falling back to rsync")
+
+        # Local-to-local fast path; pairs with deletion stay on rsync
+        if (self.use_fast_copy and not dry_run and not daemon_pair
+                and sys.platform.startswith("linux")
+                and hasattr(os, "copy_file_range")
+                and "--delete" not in rsync_options):
+            success, message = self._bulk_copy_tree(source, destination)
+            if success:
+                self.logger.info(f"'{name}': {message}")
+                return True
+            self.logger.warning(f"'{name}': {message} - falling back to rsync")
+
+        # Checksum-mode pre-filter: with the digest cache holding both
+        # sides, the set of differing files is known before rsync starts.
+        # Only those paths are handed over via --files-from, with
+        # --checksum dropped so rsync re-hashes nothing; when the caches
+        # fully agree the spawn is skipped outright. Pairs with --delete
+        # stay on the normal path so deletions still propagate.
+        diff_list_tmp = None
+        # fast-verify hashes directly when no cache is configured;
+        # checksum mode without a cache stays on plain rsync --checksum
+        if (((self.checksum_mode and self.checksum_cache is not None)
+                or self.fast_verify)
+                and not dry_run and not daemon_pair
+                and "--delete" not in rsync_options):
+            diffs, scanned = self._checksum_diff_list(source, destination)
+            self.logger.info(
+                f"'{name}': scanned {scanned} files, {len(diffs)} differ")
+            if not diffs:
+                self.logger.info(f"'{name}' checksum caches agree - skipping rsync")
+                return True
+            diff_list_tmp = tempfile.NamedTemporaryFile(
+                mode='w', prefix="sync_diff_", suffix=".txt", delete=False)
+            diff_list_tmp.write("\n".join(diffs) + "\n")
+            diff_list_tmp.close()
+            rsync_options = [opt for opt in rsync_options
+                             if opt != "--checksum"
+                             and not opt.startswith("--checksum-choice")]
+            rsync_options.append(f"--files-from={diff_list_tmp.name}")
+
+        # Run rsync (chunked into parallel streams when configured)
+        if diff_list_tmp is not None:
+            try:
+                success, output = self.run_rsync(source, destination, rsync_options, dry_run)
+            finally:
+                os.unlink(diff_list_tmp.name)
+        elif (self.parallel_chunks > 1 and not dry_run and not daemon_pair
+                and "--delete" not in rsync_options):
+            success, output = self.run_rsync_chunked(
+                source, destination, rsync_options, n_chunks=self.parallel_chunks)
+        else:
+            success, output = self.run_rsync(source, destination, rsync_options, dry_run)
+
         if success:
-            # Parse output to show what happened
-            output_lines = output.strip().split('\n')
-            
-            # Extract file transfer lines (itemize-changes output)
-            file_changes = []
-            stats_section = False
-            stats_lines = []
-            
-            for line in output_lines:
-                line = line.strip()
-                if not line:
-                    continue
-                # Itemize-changes lines start with indicators like >f, >d, etc.
-                if line and (line.startswith('>') or line.startswith('<') or line.startswith('c') or line.startswith('h') or line.startswith('*')):
-                    file_changes.append(line)
-                # Stats section starts with "Number of files"
-                elif "Number of files" in line or "Total file size" in line or "Total transferred file size" in line:
-                    stats_section = True
-                    stats_lines.append(line)
-                elif stats_section and (":" in line or line.startswith("sent ") or line.startswith("total size")):
-                    stats_lines.append(line)
-            
-            if file_changes:
-                self.logger.info(f"Sync completed successfully for '{name}' - Files changed:")
-                for line in file_changes[:20]:  # Show first 20 changes
-                    self.logger.info(f"  {line}")
-                if len(file_changes) > 20:
-                    self.logger.info(f"  ... and {len(file_changes) - 20} more files")
-            elif stats_lines:
-                # Show stats if available
-                self.logger.info(f"Sync completed successfully for '{name}' - Statistics:")
-                for line in stats_lines[:10]:  # Show first 10 stat lines
-                    self.logger.info(f"  {line}")
-            else:
-                # Fallback to basic summary
-                summary_lines = [line for line in output_lines if line.startswith('sent ') or line.startswith('total size')]
-                if summary_lines:
-                    self.logger.info(f"Sync completed successfully for '{name}' - No files needed transfer (already in sync)")
-                    for line in summary_lines:
-                        self.logger.info(f"  {line}")
-                else:
-                    self.logger.info(f"Sync completed successfully for '{name}' - No files needed transfer (already in sync)")
+            # All of this parsing only feeds INFO logging; skip it outright
+            # when the level is disabled
+            if self.logger.isEnabledFor(logging.INFO):
+                # Parse output to show what happened
+                output_lines = output.strip().split('\n')
+
+                # Extract file transfer lines (itemize-changes output)
+                file_changes = []
+                stats_section = False
+                stats_lines = []
+
+                for line in output_lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # Itemize-changes lines start with indicators like >f, >d, etc.
+                    if line.startswith(_CHANGE_PREFIXES):
+                        file_changes.append(line)
+                    # Stats section starts with "Number of files"
+                    elif _STATS_RE.match(line):
+                        stats_section = True
+                        stats_lines.append(line)
+                    elif stats_section and (":" in line or line.startswith("sent ") or line.startswith("total size")):
+                        stats_lines.append(line)
+
+                with self._log_lock:
+                    if file_changes:
+                        self.logger.info(f"Sync completed successfully for '{name}' - Files changed:")
+                        for line in file_changes[:20]:  # Show first 20 changes
+                            self.logger.info(f"  {line}")
+                        if len(file_changes) > 20:
+                            self.logger.info(f"  ... and {len(file_changes) - 20} more files")
+                    elif stats_lines:
+                        # Show stats if available
+                        self.logger.info(f"Sync completed successfully for '{name}' - Statistics:")
+                        for line in stats_lines[:10]:  # Show first 10 stat lines
+                            self.logger.info(f"  {line}")
+                    else:
+                        # Fallback to basic summary
+                        summary_lines = [line for line in output_lines if line.startswith('sent ') or line.startswith('total size')]
+                        if summary_lines:
+                            self.logger.info(f"Sync completed successfully for '{name}' - No files needed transfer (already in sync)")
+                            for line in summary_lines:
+                                self.logger.info(f"  {line}")
+                        else:
+                            self.logger.info(f"Sync completed successfully for '{name}' - No files needed transfer (already in sync)")
         else:
             self.logger.error(f"Sync failed for '{name}': {output}")
-        
+
+        # Advance the watermark to when this sync started, so changes made
+        # while it ran are still picked up next time
+        if success and not dry_run:
+            with self._marker_lock:
+                self._last_sync[name] = sync_started
+                self._last_sync_save()
+
         return success
     
-    def sync_all(self, dry_run: bool = False) -> bool:
-        """Synchronize all enabled sync pairs."""
+    def sync_group(self, pairs: List[Dict], dry_run: bool = False) -> int:
+        """Sync several pairs through a single rsync process per group.
+
+        Each pair normally costs its own fork+exec and whole-directory
+        scan. Pairs whose sources share a base, whose destinations share a
+        base, and whose options match are handed to one rsync via
+        --files-from=-, paying process startup once per group instead of
+        once per directory. Single-member groups fall back to sync_pair
+        so they keep its skip heuristics. Returns the number of pairs
+        synced successfully.
+        """
+        groups = {}
+        for pair in pairs:
+            key = (pair["source"].rsplit("/", 1)[0],
+                   pair["destination"].rsplit("/", 1)[0],
+                   tuple(pair.get("rsync_options", [])))
+            groups.setdefault(key, []).append(pair)
+
+        success_count = 0
+        for (src_base, dst_base, options), group in groups.items():
+            if len(group) == 1:
+                if self.sync_pair(group[0], dry_run):
+                    success_count += 1
+                continue
+
+            dir_names = []
+            for pair in group:
+                is_valid, error_msg = self.validate_paths(pair["source"], pair["destination"])
+                if not is_valid:
+                    self.logger.error(f"Validation failed for '{pair['name']}': {error_msg}")
+                    continue
+                dir_names.append(pair["source"].rsplit("/", 1)[1])
+            if not dir_names:
+                continue
+
+            cmd = ["rsync"]
+            cmd.extend(options)
+            # --files-from does not imply recursion, even under -a
+            cmd.extend(["--recursive", "--files-from=-"])
+            if "--progress" in cmd and not sys.stdout.isatty():
+                cmd.remove("--progress")
+            cmd.extend(self._exclude_args)
+            if dry_run:
+                cmd.append("--dry-run")
+            cmd.extend([src_base.rstrip("/") + "/", dst_base.rstrip("/") + "/"])
+
+            self.logger.info("Running grouped command (%d dirs): %s",
+                             len(dir_names), shlex.join(cmd))
+            try:
+                result = subprocess.run(
+                    cmd,
+                    input="\n".join(dir_names) + "\n",
+                    capture_output=True,
+                    text=True
+                )
+            except Exception as e:
+                self.logger.error(f"Grouped sync failed to start: {e}")
+                continue
+
+            if result.returncode != 0:
+                self.logger.error(
+                    f"Grouped sync failed with return code {result.returncode}: "
+                    f"{result.stderr.strip()}")
+            else:
+                success_count += len(dir_names)
+                self.logger.info(
+                    f"Grouped sync completed for: {', '.join(dir_names)}")
+
+        return success_count
+
+    def sync_all(self, dry_run: bool = False, max_workers: int = 1) -> bool:
+        """Synchronize all enabled sync pairs.
+
+        With max_workers > 1, pairs run concurrently in a thread pool so
+        I/O wait on one pair (e.g. the thumb drive) overlaps with work on
+        another. Each pair targets an independent directory, so the only
+        shared state is the logger, which is guarded by a lock.
+        """
+        self._stat_cache.clear()
         self.logger.info("Starting synchronization process")
-        
+
         if dry_run:
             self.logger.info("DRY RUN MODE - No actual changes will be made")
-        
+
+        pairs = []
+        for pair in self.config["sync_pairs"]:
+            if not pair.get("enabled", True):
+                self.logger.info(f"Skipping disabled sync pair: {pair['name']}")
+                continue
+            pairs.append(pair)
+
         success_count = 0
-        total_count = 0
-        
+        total_count = len(pairs)
+
+        if max_workers > 1 and total_count > 1:
+            # The two directions of a bidirectional pair touch the same
+            # directory, so they are grouped into one worker and run in
+            # order; independent groups run concurrently. Threads suffice
+            # because the work is subprocess.run, which releases the GIL.
+            dir_groups = {}
+            for pair in pairs:
+                key = os.path.basename(pair["source"].rstrip("/"))
+                dir_groups.setdefault(key, []).append(pair)
+
+            # Directory groups whose remote side sits on the same physical
+            # device are then merged into one worker: concurrent writers
+            # to a single USB drive seek-thrash rather than overlap, while
+            # groups on separate devices (e.g. the /flux and /vortex
+            # network mounts) still run fully parallel.
+            def _dev(path):
+                try:
+                    return os.stat(path).st_dev
+                except OSError:
+                    return None
+
+            groups = {}
+            for key, group in dir_groups.items():
+                remote_paths = [p["destination"] for p in group
+                                if not p["name"].endswith("_to_local")]
+                dev = _dev(os.path.dirname(remote_paths[0].rstrip("/"))) if remote_paths else None
+                groups.setdefault(dev if dev is not None else ("dir", key), []).extend(group)
+
+            def _run_group(group):
+                return sum(1 for p in group if self.sync_pair(p, dry_run))
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_group, g) for g in groups.values()]
+                success_count = sum(f.result() for f in concurrent.futures.as_completed(futures))
+        else:
+            # Non-delete pairs that share a base and options (the
+            # to_local directions of the data and video dirs) collapse
+            # into one rsync per group; --delete pairs keep their own
+            # invocation so deletion stays scoped to a single directory.
+            grouped = [p for p in pairs
+                       if "--delete" not in p.get("rsync_options", [])]
+            if len(grouped) > 1:
+                singles = [p for p in pairs
+                           if "--delete" in p.get("rsync_options", [])]
+                success_count = self.sync_group(grouped, dry_run)
+                for pair in singles:
+                    if self.sync_pair(pair, dry_run):
+                        success_count += 1
+            elif self._sync_all_specialized is not None:
+                success_count = self._sync_all_specialized(dry_run)
+            else:
+                for pair in pairs:
+                    if self.sync_pair(pair, dry_run):
+                        success_count += 1
+
+        self.logger.info(f"Synchronization complete: {success_count}/{total_count} pairs successful")
+        return success_count == total_count
+    
+    def plan_all(self) -> List[Dict]:
+        """Compute the sync plan with a single dry-run pass per pair.
+
+        Running sync_all(dry_run=True) followed by sync_all(dry_run=False)
+        walks and (in checksum mode) hashes every tree twice. plan_all does
+        the dry-run walk once and records which pairs actually have changes,
+        so execute_plan can skip the pairs that are already in sync.
+        """
+        self._stat_cache.clear()
+        plan = []
         for pair in self.config["sync_pairs"]:
             if not pair.get("enabled", True):
                 self.logger.info(f"Skipping disabled sync pair: {pair['name']}")
                 continue
-            
+
+            is_valid, error_msg = self.validate_paths(pair["source"], pair["destination"])
+            if not is_valid:
+                self.logger.error(f"Validation failed for '{pair['name']}': {error_msg}")
+                plan.append({"pair": pair, "changes": None, "error": error_msg})
+                continue
+
+            success, output = self.run_rsync(
+                pair["source"], pair["destination"],
+                pair.get("rsync_options", []), dry_run=True)
+            if not success:
+                self.logger.error(f"Dry run failed for '{pair['name']}': {output}")
+                plan.append({"pair": pair, "changes": None, "error": output})
+                continue
+
+            # Itemize-changes lines mark the files that would transfer
+            changes = [line.strip() for line in output.splitlines()
+                       if line.strip().startswith(_CHANGE_PREFIXES)]
+
+            # The stats2 block of this dry run already carries the
+            # transfer size, so stash it where sync_pair's free-space
+            # preflight looks; execute_plan then skips the second
+            # dry-run walk _estimate_transfer would otherwise pay
+            match = re.search(r"Total transferred file size: ([\d,]+) bytes", output)
+            if match is not None:
+                pair["_est_bytes"] = int(match.group(1).replace(",", ""))
+
+            plan.append({"pair": pair, "changes": changes, "error": None})
+
+        return plan
+
+    def print_plan(self, plan: List[Dict]):
+        """Print a summary of the plan computed by plan_all."""
+        print("\nSync plan:")
+        print("=" * 50)
+        for entry in plan:
+            name = entry["pair"]["name"]
+            if entry["error"] is not None:
+                print(f"{name}: ERROR ({entry['error']})")
+            elif entry["changes"]:
+                print(f"{name}: {len(entry['changes'])} file(s) to transfer")
+                for line in entry["changes"][:20]:
+                    print(f"  {line}")
+                if len(entry["changes"]) > 20:
+                    print(f"  ... and {len(entry['changes']) - 20} more files")
+            else:
+                print(f"{name}: already in sync")
+        print()
+
+    def execute_plan(self, plan: List[Dict]) -> bool:
+        """Execute the plan from plan_all, skipping pairs with no changes."""
+        success_count = 0
+        total_count = 0
+
+        for entry in plan:
+            pair = entry["pair"]
+            if entry["error"] is not None:
+                total_count += 1
+                continue
+            if not entry["changes"]:
+                self.logger.info(f"'{pair['name']}' already in sync - skipping")
+                continue
+
             total_count += 1
-            if self.sync_pair(pair, dry_run):
+            if self.sync_pair(pair, dry_run=False):
                 success_count += 1
-        
-        self.logger.info(f"Synchronization complete: {success_count}/{total_count} pairs successful")
+
+        self.logger.info(f"Plan execution complete: {success_count}/{total_count} pairs successful")
         return success_count == total_count
-    
+
     def list_sync_pairs(self):
-        """List all configured sync pairs."""
-        print("\nConfigured Sync Pairs:")
-        print("=" * 50)
-        
-        for i, pair in enumerate(self.config["sync_pairs"], 1):
+        """List all configured sync pairs.
+
+        Formats the whole listing from the precomputed pair table and emits
+        it with one write, so the output stays atomic when pairs run
+        concurrently and logging goes to a file on the thumb drive.
+        """
+        lines = ["", "Configured Sync Pairs:", "=" * 50]
+        for i, pair in enumerate(self._pairs_by_name.values(), 1):
             status = "ENABLED" if pair.get("enabled", True) else "DISABLED"
-            print(f"{i}. {pair['name']} [{status}]")
-            print(f"   Source: {pair['source']}")
-            print(f"   Destination: {pair['destination']}")
-            print(f"   Options: {' '.join(pair.get('rsync_options', []))}")
-            print()
+            lines.append(f"{i}. {pair['name']} [{status}]")
+            lines.append(f"   Source: {pair['source']}")
+            lines.append(f"   Destination: {pair['destination']}")
+            lines.append(f"   Options: {' '.join(pair.get('rsync_options', []))}")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def sync_pair_by_name(self, pair_name: str, dry_run: bool = False) -> bool:
-        """Synchronize a specific pair by name."""
-        for pair in self.config["sync_pairs"]:
-            if pair["name"] == pair_name:
-                return self.sync_pair(pair, dry_run)
-        
-        self.logger.error(f"Sync pair '{pair_name}' not found")
-        return False
+        """Synchronize a specific pair by name (O(1) table lookup)."""
+        pair = self._pairs_by_name.get(pair_name)
+        if pair is None:
+            self.logger.error(f"Sync pair '{pair_name}' not found")
+            return False
+        return self.sync_pair(pair, dry_run)
 
 
 def create_sync_manager(local_data_root: str, local_video_root: str, data_dirs: List[str], 
                        video_dirs: List[str], one_way_video_dirs: List[str],
                        remote_data_base: str = "/media/mmchenry/ThumbDrive/",
                        remote_video_base: str = "/media/mmchenry/ThumbDrive/",
-                       checksum_mode: bool = False) -> DataSyncManager:
+                       checksum_mode: bool = False,
+                       hash_algo: str = "xxh128",
+                       append_mode: bool = False,
+                       daemon_url: str = None,
+                       cache_db: str = None,
+                       use_fast_copy: bool = False,
+                       parallel_chunks: int = 1,
+                       warmup: bool = True,
+                       merkle_file: str = None) -> DataSyncManager:
     """Create and configure a DataSyncManager with the provided parameters."""
     
     print(f"Local data root: {local_data_root}")
@@ -515,11 +1795,24 @@ def create_sync_manager(local_data_root: str, local_video_root: str, data_dirs:
     print(f"Remote data base: {remote_data_base}")
     print(f"Remote video base: {remote_video_base}")
     
-    # Setup directories
-    setup_sync_directories(data_dirs, video_dirs, one_way_video_dirs, remote_data_base, remote_video_base)
-    
+    # Setup directories. In daemon mode the remote bases live behind the
+    # rsync daemon (the drive is usually not mounted here), so there is
+    # nothing local to mkdir or pre-warm.
+    if daemon_url is None:
+        setup_sync_directories(data_dirs, video_dirs, one_way_video_dirs, remote_data_base, remote_video_base)
+
+        # Warm the remote metadata cache before the first sync pair runs
+        if warmup:
+            for base in {remote_data_base, remote_video_base}:
+                warm_directory_cache(base)
+
+
     # Create sync manager with custom configuration
-    sync_manager = DataSyncManager(checksum_mode=checksum_mode)
+    sync_manager = DataSyncManager(checksum_mode=checksum_mode, hash_algo=hash_algo)
+    sync_manager.use_fast_copy = use_fast_copy
+    sync_manager.parallel_chunks = max(1, parallel_chunks)
+    sync_manager.append_mode = append_mode
+    sync_manager.daemon_url = daemon_url
     sync_manager.local_data_root = local_data_root
     sync_manager.local_video_root = local_video_root
     sync_manager.data_dirs = data_dirs
@@ -527,8 +1820,23 @@ def create_sync_manager(local_data_root: str, local_video_root: str, data_dirs:
     sync_manager.one_way_video_dirs = one_way_video_dirs
     sync_manager.remote_data_base = remote_data_base
     sync_manager.remote_video_base = remote_video_base
-    
-    # Setup logging now that remote paths are configured
+
+    # Open the persistent checksum cache (skipped if the location is unusable)
+    if cache_db:
+        try:
+            os.makedirs(os.path.dirname(cache_db), exist_ok=True)
+            sync_manager.checksum_cache = ChecksumCache(cache_db)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: could not open checksum cache {cache_db}: {e}")
+
+    # Load subtree digests from the previous run
+    if merkle_file:
+        sync_manager.merkle_file = merkle_file
+        sync_manager._merkle_load()
+
+
+    # Refresh cached paths and set up logging now that remote paths are configured
+    sync_manager._finalize_paths()
     sync_manager.setup_logging()
     
     # Reload configuration with new parameters
@@ -550,6 +1858,18 @@ def main():
                        help="Sync only a specific pair by name")
     parser.add_argument("--checksum", action="store_true", 
                        help="Use checksum comparison instead of timestamps for file comparison")
+    parser.add_argument("--fast-verify", action="store_true", 
+                       help="Verify with local blake3/xxh128 digests instead of rsync --checksum")
+    parser.add_argument("--append-mode", action="store_true", 
+                       help="Resume growing video files from the destination tail (--append-verify)")
+    parser.add_argument("--rsyncable-archives", action="store_true", 
+                       help="Recompress large .gz archives with gzip --rsyncable before syncing")
+    parser.add_argument("--daemon-url", type=str, 
+                       help="rsync daemon URL (rsync://host/module) replacing the remote bases")
+    parser.add_argument("--jobs", type=int, default=1, 
+                       help="Number of sync pairs to run concurrently")
+    parser.add_argument("--chunks", type=int, default=1, 
+                       help="Split each large pair across this many parallel rsync streams")
     parser.add_argument("--remote-data-base", type=str, 
                        help="Remote base path for data directories")
     parser.add_argument("--remote-video-base", type=str, 
@@ -602,8 +1922,14 @@ def main():
         one_way_video_dirs=one_way_video_dirs,
         remote_data_base=remote_data_base,
         remote_video_base=remote_video_base,
-        checksum_mode=args.checksum
+        checksum_mode=args.checksum,
+        hash_algo="blake3" if args.fast_verify else "xxh128",
+        append_mode=args.append_mode,
+        daemon_url=args.daemon_url,
+        parallel_chunks=args.chunks
     )
+    sync_manager.fast_verify = args.fast_verify
+    sync_manager.rsyncable_archives = args.rsyncable_archives
     
     if args.list:
         sync_manager.list_sync_pairs()
@@ -611,19 +1937,11 @@ def main():
     
     if args.pair:
         # Sync specific pair
-        pair_found = False
-        for pair in sync_manager.config["sync_pairs"]:
-            if pair["name"] == args.pair:
-                pair_found = True
-                sync_manager.sync_pair(pair, args.dry_run)
-                break
-        
-        if not pair_found:
-            print(f"Error: Sync pair '{args.pair}' not found")
+        if not sync_manager.sync_pair_by_name(args.pair, args.dry_run):
             sys.exit(1)
     else:
         # Sync all pairs
-        success = sync_manager.sync_all(args.dry_run)
+        success = sync_manager.sync_all(args.dry_run, max_workers=max(1, args.jobs))
         sys.exit(0 if success else 1)
 
 
@@ -7,6 +7,7 @@ called "Mac Backup" in a folder called "Backup".
 """
 
 import os
+import stat
 import sys
 import subprocess
 import logging
@@ -16,6 +17,59 @@ from datetime import datetime
 from typing import Tuple
 
 
+# Exclude patterns for Mac backup. Static data, so it lives at module
+# scope as a tuple with the file payload prebuilt once at import.
+_EXCLUDE_PATTERNS = (
+    # System files and caches
+    ".DS_Store",
+    ".Trash",
+    ".Spotlight-V100",
+    ".fseventsd",
+    ".TemporaryItems",
+    ".VolumeIcon.icns",
+    ".com.apple.timemachine.donotpresent",
+
+    # Application caches and temporary files
+    "Library/Caches/*",
+    "Library/Application Support/CrashReporter/*",
+    "Library/Logs/*",
+    "Library/Preferences/com.apple.LaunchServices*",
+
+    # Browser caches (optional - remove if you want to backup browser data)
+    "Library/Application Support/Google/Chrome/Default/Cache/*",
+    "Library/Application Support/Firefox/Profiles/*/cache2/*",
+    "Library/Application Support/Safari/LocalStorage/*",
+
+    # Development and build artifacts
+    "node_modules",
+    "__pycache__",
+    "*.pyc",
+    ".git",
+    ".svn",
+    "build",
+    "dist",
+    "*.log",
+    "*.tmp",
+
+    # Large media files that might not need backup (optional)
+    # Uncomment the following lines if you don't want to backup these:
+    # "Movies/*",
+    # "Music/*",
+    # "Pictures/*",
+
+    # Virtual machines and large files
+    "*.dmg",
+    "*.iso",
+    "*.vmdk",
+    "*.vdi",
+
+    # Time Machine backups (if any)
+    "Backups.backupdb"
+)
+
+_EXCLUDE_FILE_PAYLOAD = "\n".join(_EXCLUDE_PATTERNS) + "\n"
+
+
 class MacBackupManager:
     def __init__(self, dry_run: bool = False, verbose: bool = False, checksum_mode: bool = False):
         """Initialize the MacBackupManager."""
@@ -27,11 +81,19 @@ class MacBackupManager:
         self.source_path = "/Users/mmchenry"
         self.backup_drive_name = "Mac Backup"
         self.backup_folder = "Backup MacPro"
+        self.backup_root = None
         self.destination_path = None
-        
+        self.prev_backup = None
+
         # Setup logging
         self.setup_logging()
-        
+
+        # The pattern list is constant, so write it once at startup and
+        # hand rsync --exclude-from=<path> instead of re-sending the same
+        # text down stdin on every invocation
+        self.exclude_file = Path.cwd() / "logs" / "rsync_excludes.txt"
+        self.exclude_file.write_text(_EXCLUDE_FILE_PAYLOAD)
+
         # Find the backup drive
         self.find_backup_drive()
     
@@ -73,44 +135,73 @@ class MacBackupManager:
                     self.logger.info(f"  - {volume.name}")
             sys.exit(1)
         
-        # Set the full destination path
-        self.destination_path = backup_drive_path / self.backup_folder
-        
+        # Each run backs up into a fresh timestamped snapshot; unchanged
+        # files become hardlinks into the previous snapshot via
+        # --link-dest, so rotation costs neither space nor transfer time
+        self.backup_root = backup_drive_path / self.backup_folder
+        self.prev_backup = self._find_latest_snapshot()
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.destination_path = self.backup_root / stamp
+        # Real runs rsync into a dot-prefixed staging directory that the
+        # 20* snapshot glob never matches, renamed into place only after
+        # a clean exit - so neither dry runs nor interrupted backups can
+        # become the next run's --link-dest and force a full re-copy
+        self.staging_path = self.backup_root / f".inprogress_{stamp}"
+
         self.logger.info(f"Found backup drive: {backup_drive_path}")
         self.logger.info(f"Destination path: {self.destination_path}")
+        if self.prev_backup is not None:
+            self.logger.info(f"Hardlinking unchanged files against: {self.prev_backup}")
+
+    def _find_latest_snapshot(self):
+        """Return the most recent timestamped snapshot directory, if any."""
+        try:
+            snapshots = sorted(p for p in self.backup_root.glob("20*") if p.is_dir())
+        except OSError:
+            return None
+        return snapshots[-1] if snapshots else None
     
     def validate_paths(self) -> Tuple[bool, str]:
-        """Validate that source and destination paths exist and are accessible."""
-        source_path = Path(self.source_path)
-        
-        if not source_path.exists():
+        """Validate that source and destination paths exist and are accessible.
+
+        One os.stat per endpoint answers both the exists and is-dir
+        questions; Path.exists()/is_dir() would each stat again.
+        """
+        try:
+            src_stat = os.stat(self.source_path)
+        except OSError:
             return False, f"Source path does not exist: {self.source_path}"
-        
-        if not source_path.is_dir():
+
+        if not stat.S_ISDIR(src_stat.st_mode):
             return False, f"Source path is not a directory: {self.source_path}"
-        
-        # Create destination directory if it doesn't exist
-        dest_path = Path(self.destination_path)
-        if not dest_path.exists():
+
+        # Create the staging directory for real runs only; a dry run must
+        # not leave an empty snapshot behind for the next run to hardlink
+        # against
+        if not self.dry_run:
             try:
-                dest_path.mkdir(parents=True, exist_ok=True)
-                self.logger.info(f"Created destination directory: {dest_path}")
+                os.makedirs(self.staging_path, exist_ok=True)
+                self.logger.info(f"Created staging directory: {self.staging_path}")
             except Exception as e:
-                return False, f"Cannot create destination directory: {e}"
-        
+                return False, f"Cannot create staging directory: {e}"
+
         return True, "OK"
     
-    def build_rsync_command(self) -> list:
+    def build_rsync_command(self) -> Tuple[list, tuple]:
         """Build the rsync command with appropriate options."""
         cmd = ["rsync"]
         
-        # Basic rsync options
+        # Basic rsync options. progress2 emits one rolling aggregate line
+        # instead of a line per file traversed, which keeps the logged
+        # stream small on a whole-home tree.
         cmd.extend([
-            "-av",                    # Archive mode, verbose
-            "--progress",            # Show progress
+            "-a",                     # Archive mode
+            "--whole-file",          # Both ends are local mounts; skip delta-transfer CPU
+            "--info=progress2,stats2",  # Aggregate progress + summary stats
+            "--no-inc-recursive",    # Full file list up front so progress2 percentages hold
             "--delete",              # Delete files in destination that don't exist in source
             "--delete-excluded",     # Delete excluded files from destination
-            "--exclude-from=-"       # Read exclude patterns from stdin
+            f"--exclude-from={self.exclude_file}"  # Pattern file written at startup
         ])
         
         # Add checksum option if enabled
@@ -120,92 +211,69 @@ class MacBackupManager:
         # Add dry run option
         if self.dry_run:
             cmd.append("--dry-run")
+
+        # Unchanged files are hardlinked from the previous snapshot:
+        # readdir + link instead of a data copy
+        if self.prev_backup is not None:
+            cmd.extend(["--link-dest", str(self.prev_backup)])
         
-        # Exclude patterns for Mac backup
-        exclude_patterns = [
-            # System files and caches
-            ".DS_Store",
-            ".Trash",
-            ".Spotlight-V100",
-            ".fseventsd",
-            ".TemporaryItems",
-            ".VolumeIcon.icns",
-            ".com.apple.timemachine.donotpresent",
-            
-            # Application caches and temporary files
-            "Library/Caches/*",
-            "Library/Application Support/CrashReporter/*",
-            "Library/Logs/*",
-            "Library/Preferences/com.apple.LaunchServices*",
-            
-            # Browser caches (optional - remove if you want to backup browser data)
-            "Library/Application Support/Google/Chrome/Default/Cache/*",
-            "Library/Application Support/Firefox/Profiles/*/cache2/*",
-            "Library/Application Support/Safari/LocalStorage/*",
-            
-            # Development and build artifacts
-            "node_modules",
-            "__pycache__",
-            "*.pyc",
-            ".git",
-            ".svn",
-            "build",
-            "dist",
-            "*.log",
-            "*.tmp",
-            
-            # Large media files that might not need backup (optional)
-            # Uncomment the following lines if you don't want to backup these:
-            # "Movies/*",
-            # "Music/*",
-            # "Pictures/*",
-            
-            # Virtual machines and large files
-            "*.dmg",
-            "*.iso",
-            "*.vmdk",
-            "*.vdi",
-            
-            # Time Machine backups (if any)
-            "Backups.backupdb"
-        ]
-        
-        # Add source and destination
-        cmd.extend([f"{self.source_path}/", str(self.destination_path)])
-        
-        return cmd, exclude_patterns
+        # Add source and destination. Dry runs write nothing, so they
+        # preview against the final snapshot name; real runs go through
+        # the staging directory and are renamed on success.
+        target = self.destination_path if self.dry_run else self.staging_path
+        cmd.extend([f"{self.source_path}/", str(target)])
+
+        return cmd, _EXCLUDE_PATTERNS
     
     def run_backup(self) -> Tuple[bool, str]:
-        """Execute the backup using rsync."""
+        """Execute the backup using rsync, streaming its output line by line.
+
+        A whole-home backup runs for hours and produces a large progress
+        stream; buffering it all (capture_output=True) holds the output in
+        memory and shows nothing until rsync exits. Streaming keeps memory
+        at one line and surfaces progress in the log as it happens.
+        """
         cmd, exclude_patterns = self.build_rsync_command()
-        
+
         self.logger.info(f"Running backup command: {' '.join(cmd)}")
         self.logger.info(f"Excluding patterns: {len(exclude_patterns)} patterns")
-        
+
         try:
-            # Prepare exclude patterns for stdin
-            exclude_input = '\n'.join(exclude_patterns)
-            
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                input=exclude_input,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                check=True
+                bufsize=1
             )
-            
-            output = result.stdout
-            if result.stderr:
-                output += f"\nStderr: {result.stderr}"
-            
-            return True, output
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = f"rsync failed with return code {e.returncode}: {e.stderr}"
-            return False, error_msg
         except Exception as e:
-            error_msg = f"Unexpected error running rsync: {e}"
-            return False, error_msg
+            return False, f"Unexpected error running rsync: {e}"
+
+        # Keep a tail of recent lines for the post-run summary
+        tail = []
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            if line:
+                self.logger.info(line)
+                tail.append(line)
+                if len(tail) > 200:
+                    del tail[0]
+
+        proc.stdout.close()
+        returncode = proc.wait()
+
+        output = '\n'.join(tail)
+        if returncode != 0:
+            return False, f"rsync failed with return code {returncode}: {output}"
+
+        # Promote the finished staging directory to its snapshot name
+        if not self.dry_run:
+            try:
+                os.rename(self.staging_path, self.destination_path)
+            except OSError as e:
+                return False, f"Could not finalize snapshot {self.destination_path}: {e}"
+
+        return True, output
     
     def backup(self) -> bool:
         """Perform the backup operation."""